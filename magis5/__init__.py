@@ -0,0 +1,3 @@
+"""Extração de pedidos Magis5 para Power BI e dashboards Streamlit."""
+
+__version__ = "5.1.0"
@@ -0,0 +1,158 @@
+import json
+import logging
+import time
+
+import requests
+
+# Tempo de espera antes da próxima tentativa (backoff exponencial)
+def _backoff(config, attempt):
+    return config.initial_sleep * (config.backoff_factor ** (attempt - 1))
+
+# Função para verificar conexão com a API
+def test_api_connection(config):
+    try:
+        response = requests.get(f"{config.api_base_url}/orders", headers=config.headers,
+                                params={"limit": "1"}, timeout=config.timeout)
+        if response.status_code == 200:
+            logging.info("Conexão com API testada com sucesso")
+            return True
+        else:
+            logging.error(f"Falha na conexão: Status {response.status_code}")
+            return False
+    except Exception as e:
+        logging.error(f"Erro de conexão: {e}")
+        return False
+
+# Função segura para extrair dados aninhados
+def safe_get(data, keys, default=None):
+    if data is None:
+        return default
+
+    temp = data
+    for key in keys:
+        if isinstance(temp, dict) and key in temp and temp[key] is not None:
+            temp = temp[key]
+        else:
+            return default
+    return temp
+
+# Busca pedidos simples com paginação. Retorna (pedidos, completo): completo é False
+# quando a busca parou antes da última página (erro, tentativas esgotadas ou max_pages)
+def fetch_simple_orders(config, endpoint="orders", params=None):
+    params = dict(config.params_simple if params is None else params)
+    all_data = []
+    page = 1
+    complete = False
+
+    while True:  # Processará todas as páginas disponíveis (ou até config.max_pages)
+        if config.max_pages and page > config.max_pages:
+            logging.info(f"Limite de {config.max_pages} páginas atingido")
+            break
+
+        params['page'] = str(page)
+        url = f"{config.api_base_url}/{endpoint}"
+        logging.info(f"Buscando página {page} de pedidos simples...")
+
+        for attempt in range(1, config.max_retries + 1):
+            try:
+                response = requests.get(url, headers=config.headers, params=params, timeout=config.timeout)
+                response.raise_for_status()  # Lança exceção para status não 2xx
+                break
+            except requests.exceptions.HTTPError as e:
+                logging.error(f"Erro HTTP: {e}")
+                if response.status_code in [401, 403]:
+                    logging.error("Erro de autenticação - verifique o token API")
+                    return all_data, False
+                if attempt == config.max_retries:
+                    logging.error(f"Máximo de tentativas atingido para página {page}")
+                    return all_data, False
+                sleep_time = _backoff(config, attempt)
+                logging.info(f"Tentativa {attempt} falhou. Nova tentativa em {sleep_time}s")
+                time.sleep(sleep_time)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                logging.error(f"Erro de conexão: {e}")
+                if attempt == config.max_retries:
+                    logging.error(f"Máximo de tentativas atingido para página {page}")
+                    return all_data, False
+                time.sleep(_backoff(config, attempt))
+
+        try:
+            data = response.json()
+            # Validar estrutura da resposta
+            if 'orders' not in data:
+                logging.error(f"Resposta inesperada da API: {data}")
+                break
+
+            orders = data.get('orders', [])
+
+            if not orders:
+                logging.info("Nenhum pedido retornado. Finalizando.")
+                complete = True
+                break
+
+            # Adicionar todos os pedidos, mesmo que não tenham o campo 'id'
+            all_data.extend(orders)
+            logging.info(f"Página {page}: {len(orders)} pedidos obtidos")
+
+            if len(orders) < int(params.get('limit', 50)):
+                logging.info("Última página alcançada")
+                complete = True
+                break
+
+            page += 1
+            time.sleep(0.5)  # Evita throttling da API
+
+        except json.JSONDecodeError:
+            logging.error(f"Erro ao decodificar JSON da resposta para página {page}")
+            break
+        except Exception as e:
+            logging.error(f"Erro ao processar resposta: {e}")
+            break
+
+    logging.info(f"Total de pedidos simples obtidos: {len(all_data)}")
+    return all_data, complete
+
+# Busca detalhes completos de um pedido
+def fetch_complete_order(config, order_id):
+    if not order_id:
+        logging.warning("ID de pedido vazio recebido")
+        return None
+
+    url = f"{config.api_base_url}/orders/{order_id}"
+    logging.debug(f"Buscando pedido completo: {order_id}")
+
+    for attempt in range(1, config.max_retries + 1):
+        try:
+            response = requests.get(url, headers=config.headers, timeout=config.timeout)
+
+            if response.status_code == 200:
+                data = response.json()
+                # Validar dados mínimos necessários
+                if 'id' not in data:
+                    logging.warning(f"Pedido {order_id} sem ID na resposta")
+                    return None
+                return data
+            elif response.status_code == 404:
+                logging.warning(f"Pedido {order_id} não encontrado")
+                return None
+            elif attempt < config.max_retries:
+                sleep_time = _backoff(config, attempt)
+                logging.info(f"Pedido {order_id}: tentativa {attempt} falhou (status {response.status_code}). Nova tentativa em {sleep_time}s",
+                             extra={"sample_key": "retry_pedido"})
+                time.sleep(sleep_time)
+            else:
+                logging.error(f"Falha após {config.max_retries} tentativas para pedido {order_id} (status {response.status_code})")
+                return None
+        except json.JSONDecodeError:
+            # Só as tentativas intermediárias são amostradas; a falha final sempre aparece com o ID
+            if attempt == config.max_retries:
+                logging.error(f"Resposta inválida para pedido {order_id} após {config.max_retries} tentativas")
+                return None
+            logging.info(f"Pedido {order_id}: resposta inválida na tentativa {attempt}", extra={"sample_key": "retry_pedido"})
+            time.sleep(_backoff(config, attempt))
+        except Exception as e:
+            if attempt == config.max_retries:
+                logging.error(f"Erro ao buscar pedido {order_id} após {config.max_retries} tentativas: {e}")
+                return None
+            logging.info(f"Pedido {order_id}: tentativa {attempt} falhou ({e})", extra={"sample_key": "retry_pedido"})
+            time.sleep(_backoff(config, attempt))
@@ -0,0 +1,220 @@
+import gc
+import json
+import multiprocessing
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Comandos medidos no benchmark de inicialização (cada um em um processo novo)
+STARTUP_COMMANDS = {
+    "cli --help": [sys.executable, "-m", "magis5", "--help"],
+    "extract --dry-run": [sys.executable, "-m", "magis5", "extract", "--dry-run"],
+    "import requests": [sys.executable, "-c", "import requests"],
+    "import pandas": [sys.executable, "-c", "import pandas"],
+}
+
+DASHBOARDS = ["streamlit01", "streamlit02", "streamlit03"]
+STAGES = ["load", "query", "filtered", "chart", "refresh"]
+REFRESH_FRACTION = 0.01  # Pedidos acrescentados ao CSV a cada medida de "refresh"
+
+# Mede o tempo de parede de um comando em subprocesso
+def _time_command(command, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        elapsed = time.perf_counter() - start
+        if result.returncode != 0:
+            return None
+        timings.append(elapsed)
+    return timings
+
+# Benchmark de inicialização da CLI e dos módulos pesados
+def run_startup(repeat=5, out=sys.stdout):
+    env_note = f"Python {sys.version.split()[0]} em {os.name}"
+    print(f"Benchmark de inicialização ({repeat} execuções, {env_note})", file=out)
+    print(f"{'comando':<22} {'mediana':>10} {'mínimo':>10}", file=out)
+    results = {}
+    for name, command in STARTUP_COMMANDS.items():
+        timings = _time_command(command, repeat)
+        results[name] = timings
+        if timings is None:
+            print(f"{name:<22} {'falhou':>10}", file=out)
+        else:
+            print(f"{name:<22} {statistics.median(timings) * 1000:>8.0f}ms {min(timings) * 1000:>8.0f}ms", file=out)
+    return results
+
+# Etapas de cada dashboard, no mesmo caminho que eles executam com magis5.live:
+# load     carga do CSV e montagem dos rollups (LiveOrders + primeiro refresh)
+# query    consulta da tela padrão sobre os rollups filtrados por data
+# filtered painel com filtro avançado (streamlit03), que agrega a partir das linhas
+# chart    montagem dos gráficos (só se as bibliotecas estiverem instaladas)
+# refresh  refresh incremental após acrescentar pedidos ao CSV (metade com ids já
+#          existentes, que substituem os anteriores)
+# Cada etapa recebe o contexto com o caminho do CSV e os resultados das anteriores.
+def _dashboard_stages():
+    import pandas as pd
+
+    from . import charts
+    from .dashboard_data import PANEL_COLUMNS
+    from .live import LiveOrders
+
+    def load(columns):
+        def run(ctx):
+            live = LiveOrders(ctx["path"], columns)
+            live.refresh()
+            return live
+        return run
+
+    def full_range(ctx):
+        return ctx["load"].date_range()
+
+    def last_year(ctx):
+        end = ctx["load"].date_range()[1]
+        return end - pd.DateOffset(years=1), end
+
+    def refresh(ctx):
+        return ctx["load"].refresh()
+
+    return {
+        "streamlit01": {"load": load(None), "query": lambda ctx: ctx["load"].sales_summary(*full_range(ctx)),
+                        "chart": lambda ctx: charts.sales_plotly(ctx["query"]), "refresh": refresh},
+        "streamlit02": {"load": load(None), "query": lambda ctx: ctx["load"].sales_summary(*full_range(ctx)),
+                        "chart": lambda ctx: charts.sales_seaborn(ctx["query"]), "refresh": refresh},
+        "streamlit03": {"load": load(PANEL_COLUMNS), "query": lambda ctx: ctx["load"].panel_summary(*last_year(ctx)),
+                        "filtered": lambda ctx: ctx["load"].panel_summary(
+                            *last_year(ctx), canais=[ctx["load"].frame["channel"].mode().iloc[0]]),
+                        "chart": lambda ctx: charts.panel_plotly(ctx["query"]), "refresh": refresh},
+    }
+
+# Acrescenta pedidos sintéticos ao CSV de trabalho (antes de cada medida de refresh)
+def _append_orders(ctx):
+    from .config import DATASET_CSV_OPTIONS
+    from .synthetic import generate_orders
+
+    batch = max(2, int(ctx["rows"] * REFRESH_FRACTION))
+    first_id = ctx["next_id"] - batch // 2
+    orders = generate_orders(batch, seed=ctx["next_id"], first_id=first_id)
+    orders.to_csv(ctx["path"], mode="a", header=False, index=False, decimal=",",
+                  date_format="%Y-%m-%dT%H:%M:%S", **DATASET_CSV_OPTIONS)
+    ctx["next_id"] = first_id + batch
+
+# Executa a etapa `repeat` vezes (menor tempo) e uma vez sob tracemalloc (pico de
+# memória); `setup` roda antes de cada execução, fora da medida
+def _measure(func, ctx, repeat, setup=None):
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup(ctx)
+        gc.collect()
+        start = time.perf_counter()
+        func(ctx)
+        timings.append(time.perf_counter() - start)
+        _close_figures()
+    if setup:
+        setup(ctx)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func(ctx)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, min(timings), peak
+
+def _close_figures():
+    pyplot = sys.modules.get("matplotlib.pyplot")
+    if pyplot is not None:
+        pyplot.close("all")
+
+# CSV sintético para cada tamanho (reaproveitado se já existir em data_dir)
+def _dataset(rows, data_dir, seed):
+    from .synthetic import default_filename, write_orders_csv
+
+    path = os.path.join(data_dir, default_filename(rows, seed))
+    if not os.path.exists(path):
+        start = time.perf_counter()
+        write_orders_csv(path, rows, seed=seed)
+        print(f"Gerado {path} em {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    return path
+
+# Pico de memória do processo (ru_maxrss) em bytes; inclui o que o tracemalloc não
+# vê (buffers Arrow, mallocs do parser C do CSV). None onde não há o módulo resource.
+def _max_rss():
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+# Executa as etapas de um dashboard (em um processo próprio, para que o ru_maxrss
+# reflita só este dashboard e este tamanho)
+def _dashboard_worker(name, path, rows, repeat, charts):
+    os.environ.setdefault("MPLBACKEND", "Agg")
+    stages = _dashboard_stages()[name]
+    ctx = {"path": path, "rows": rows, "next_id": rows + 1}
+    results = []
+    for stage in STAGES:
+        if stage not in stages or (stage == "chart" and not charts):
+            continue
+        try:
+            ctx[stage], seconds, peak = _measure(stages[stage], ctx, repeat,
+                                                 _append_orders if stage == "refresh" else None)
+        except ImportError as e:
+            results.append({"stage": stage, "missing": e.name})
+            continue
+        results.append({"stage": stage, "seconds": seconds, "peak_bytes": peak, "max_rss_bytes": _max_rss()})
+    _close_figures()
+    return results
+
+def _mb(value):
+    return f"{value / 2**20:>8.1f} MB" if value is not None else f"{'n/d':>11}"
+
+# Benchmark dos dashboards em dados sintéticos de tamanhos crescentes. "pico traced"
+# é o pico do tracemalloc na etapa; "RSS máx." é o pico de memória do processo até o
+# fim da etapa (cada dashboard/tamanho roda em um subprocesso novo).
+def run_dashboards(rows=(100_000, 1_000_000), dashboards=DASHBOARDS, repeat=1, data_dir=None,
+                   charts=True, seed=0, json_path=None, out=sys.stdout):
+    tmp_dir = None
+    work_dir = tempfile.TemporaryDirectory(prefix="magis5_bench_work_")
+    if data_dir is None:
+        tmp_dir = tempfile.TemporaryDirectory(prefix="magis5_bench_")
+        data_dir = tmp_dir.name
+
+    results = []
+    print(f"{'linhas':>11} {'dashboard':<12} {'etapa':<10} {'tempo':>10} {'pico traced':>11} {'RSS máx.':>11}",
+          file=out)
+    context = multiprocessing.get_context("spawn")
+    try:
+        for size in rows:
+            path = _dataset(size, data_dir, seed)
+            for name in dashboards:
+                # Cópia de trabalho: o refresh acrescenta pedidos ao CSV
+                work_path = os.path.join(work_dir.name, os.path.basename(path))
+                shutil.copyfile(path, work_path)
+                with context.Pool(1) as pool:
+                    stages = pool.apply(_dashboard_worker, (name, work_path, size, repeat, charts))
+                os.remove(work_path)
+                for stage in stages:
+                    if "missing" in stage:
+                        print(f"{size:>11,} {name:<12} {stage['stage']:<10} {'n/d':>10}  "
+                              f"({stage['missing']} não instalado)", file=out)
+                        continue
+                    results.append({"rows": size, "dashboard": name, **stage})
+                    print(f"{size:>11,} {name:<12} {stage['stage']:<10} {stage['seconds']:>9.3f}s "
+                          f"{_mb(stage['peak_bytes'])} {_mb(stage['max_rss_bytes'])}", file=out)
+    finally:
+        work_dir.cleanup()
+        if tmp_dir is not None:
+            tmp_dir.cleanup()
+
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return results
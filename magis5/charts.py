@@ -0,0 +1,90 @@
+# Gráficos dos dashboards, montados a partir dos agregados de dashboard_data.
+# plotly, seaborn e matplotlib são importados apenas pela função que os usa.
+
+# Gráficos do streamlit01.py (plotly)
+def sales_plotly(resumo):
+    import plotly.express as px
+
+    fig_pag = px.bar(resumo["pagamento"], x="Tipo de Pagamento", y="Quantidade", text="Quantidade",
+                     title="Tipos de Pagamento", color="Quantidade")
+
+    fig_prod = px.bar(resumo["produtos"], x="item_title", y="item_quantity", text="item_quantity",
+                      title="Top 10 Produtos Mais Vendidos", color="item_quantity")
+    fig_prod.update_layout(xaxis_title="Produto", yaxis_title="Quantidade", xaxis_tickangle=-45)
+
+    fig_status = px.bar(resumo["status"], x="Status", y="Quantidade", text="Quantidade",
+                        title="Status dos Pedidos", color="Quantidade")
+
+    fig_lucro = px.bar(resumo["lucro"], x="item_title", y="lucro_unitario", text="lucro_unitario",
+                       title="Top 10 Produtos por Lucro Total", color="lucro_unitario")
+    fig_lucro.update_layout(xaxis_title="Produto", yaxis_title="Lucro Total (R$)", xaxis_tickangle=-45)
+
+    return {"pagamento": fig_pag, "produtos": fig_prod, "status": fig_status, "lucro": fig_lucro}
+
+# Gráficos do streamlit02.py (seaborn/matplotlib)
+def sales_seaborn(resumo):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    sns.set_theme(style="whitegrid")
+
+    fig1, ax1 = plt.subplots()
+    sns.barplot(data=resumo["pagamento"], x="Tipo de Pagamento", y="Quantidade", palette="viridis", ax=ax1)
+    ax1.set_title("Tipos de Pagamento")
+    ax1.set_xticklabels(ax1.get_xticklabels(), rotation=90)
+
+    fig2, ax2 = plt.subplots(figsize=(10, 6))
+    sns.barplot(data=resumo["produtos"], x="item_quantity", y="item_title", palette="crest", ax=ax2)
+    ax2.set_title("Top 10 Produtos Mais Vendidos")
+    ax2.set_xlabel("Quantidade")
+    ax2.set_ylabel("Produto")
+
+    fig3, ax3 = plt.subplots()
+    sns.barplot(data=resumo["status"], x="Status", y="Quantidade", palette="flare", ax=ax3)
+    ax3.set_title("Status dos Pedidos")
+    ax3.set_xticklabels(ax3.get_xticklabels(), rotation=90)
+
+    fig5, ax5 = plt.subplots(figsize=(10, 6))
+    sns.barplot(data=resumo["lucro"], x="lucro_unitario", y="item_title", palette="mako", ax=ax5)
+    ax5.set_title("Top 10 Produtos por Lucro Total")
+    ax5.set_xlabel("Lucro Total (R$)")
+    ax5.set_ylabel("Produto")
+
+    return {"pagamento": fig1, "produtos": fig2, "status": fig3, "lucro": fig5}
+
+# Gráficos do streamlit03_ploty3d.py (plotly)
+def panel_plotly(resumo):
+    import plotly.express as px
+
+    fig_dia = px.line(resumo["vendas_dia"], x="dateCreated", y="totalValue", markers=True)
+
+    fig_mes = px.bar(resumo["vendas_mes"], x="mes", y="totalValue", text="totalValue")
+    fig_mes.update_traces(texttemplate="R$ %{text:,.2f}", textposition="outside")
+
+    fig_qtd = px.pie(resumo["quantidade_canal"], names="canal_resumido", values="item_quantity",
+                     title="Distribuição de Quantidade por Canal")
+
+    fig_inv = px.bar(
+        resumo["canal_mes"],
+        x="canal_resumido", y="totalValue", color="mes",
+        barmode="group",
+        title="Total por Canal e Mês (Canal no Eixo X)"
+    )
+    fig_inv.update_layout(
+        xaxis_tickangle=-90,
+        xaxis_title="Canal",
+        yaxis_title="Valor Total",
+        legend_title="Mês",
+        legend_orientation="h",
+        legend_y=-0.3
+    )
+
+    fig_ticket = px.bar(resumo["ticket_canal_mes"], x="ticket_medio", y="canal_resumido", color="mes", orientation="h")
+    fig_ticket.update_layout(
+        legend_orientation="h",
+        legend_y=-0.3,
+        yaxis_title="Canal",
+        xaxis_title="Ticket Médio"
+    )
+
+    return {"dia": fig_dia, "mes": fig_mes, "quantidade": fig_qtd, "canal_mes": fig_inv, "ticket": fig_ticket}
@@ -0,0 +1,178 @@
+import argparse
+import sys
+
+from . import __version__
+from .config import INCREMENTAL_DATE_SEARCH_TYPE, Config, parse_timestamp
+
+# Os módulos pesados (pandas, requests, xlsxwriter) são importados apenas dentro
+# dos comandos que precisam deles, para que --help, --dry-run e --check iniciem rápido.
+
+def _add_api_options(parser):
+    group = parser.add_argument_group("API")
+    group.add_argument("--token", dest="api_token", help="Token da API (env MAGIS5_API_TOKEN)")
+    group.add_argument("--api-url", dest="api_base_url", help="URL base da API (env MAGIS5_API_BASE_URL)")
+    group.add_argument("--since", dest="timestamp_from", type=parse_timestamp,
+                       help="Data inicial AAAA-MM-DD ou epoch (env MAGIS5_TIMESTAMP_FROM)")
+    group.add_argument("--until", dest="timestamp_to", type=parse_timestamp,
+                       help="Data final AAAA-MM-DD ou epoch (padrão: agora)")
+    group.add_argument("--date-search-type", dest="date_search_type",
+                       help="Tipo de data usado na busca (env MAGIS5_DATE_SEARCH_TYPE; padrão: created no "
+                            f"extract, {INCREMENTAL_DATE_SEARCH_TYPE} no incremental, pois created não traz "
+                            "de volta pedidos antigos que mudaram de status)")
+    group.add_argument("--workers", dest="max_workers", type=int,
+                       help="Requisições paralelas de pedidos completos (env MAGIS5_MAX_WORKERS)")
+    group.add_argument("--max-pages", dest="max_pages", type=int,
+                       help="Limite de páginas de pedidos simples, 0 = sem limite (env MAGIS5_MAX_PAGES)")
+    group.add_argument("--max-retries", dest="max_retries", type=int, help="Tentativas por requisição")
+    group.add_argument("--check", action="store_true", help="Apenas testa a conexão com a API e sai")
+    group.add_argument("--dry-run", action="store_true", help="Mostra a configuração resolvida e sai")
+
+def _add_output_options(parser):
+    group = parser.add_argument_group("saída")
+    group.add_argument("--output-dir", dest="output_dir", help="Diretório de saída (env MAGIS5_OUTPUT_DIR)")
+    group.add_argument("--log-file", dest="log_file", help="Arquivo de log (env MAGIS5_LOG_FILE)")
+    group.add_argument("--log-level", dest="log_level", help="Nível de log (env MAGIS5_LOG_LEVEL)")
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="magis5", description="Extração de pedidos Magis5 para Power BI e dashboards")
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    extract = subparsers.add_parser("extract", help="Extração completa do período")
+    _add_api_options(extract)
+    _add_output_options(extract)
+    extract.add_argument("--excel-file", dest="excel_file", help="Nome do Excel final")
+    extract.add_argument("--no-csv", action="store_true", help="Não gera o CSV lido pelos dashboards")
+    extract.set_defaults(func=cmd_extract)
+
+    incremental = subparsers.add_parser("incremental", help="Busca apenas pedidos desde o último watermark")
+    _add_api_options(incremental)
+    _add_output_options(incremental)
+    incremental.add_argument("--dataset", help="CSV dos dashboards a ser atualizado (padrão: o mais recente)")
+    incremental.add_argument("--state-file", dest="state_file", help="Arquivo de estado incremental")
+    incremental.set_defaults(func=cmd_incremental)
+
+    export = subparsers.add_parser("export", help="Exporta um CSV dos dashboards para Excel")
+    _add_output_options(export)
+    export.add_argument("source", nargs="?", help="CSV de origem (padrão: o mais recente do diretório de saída)")
+    export.add_argument("-o", "--output", default="relatorio_magis5_v5.0.xlsx", help="Arquivo Excel de destino")
+    export.set_defaults(func=cmd_export)
+
+    bench = subparsers.add_parser("bench", help="Benchmarks")
+    bench.add_argument("--suite", choices=["startup", "dashboards"], default="startup", help="Conjunto de benchmarks")
+    bench.add_argument("--repeat", type=int, help="Repetições por medida (padrão: 5 startup, 1 dashboards)")
+    bench.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000],
+                       help="Tamanhos dos dados sintéticos (dashboards)")
+    bench.add_argument("--dashboards", nargs="+", choices=["streamlit01", "streamlit02", "streamlit03"],
+                       default=["streamlit01", "streamlit02", "streamlit03"], help="Dashboards medidos")
+    bench.add_argument("--data-dir", help="Diretório para guardar/reaproveitar os CSVs sintéticos")
+    bench.add_argument("--no-charts", action="store_true", help="Não mede a montagem dos gráficos")
+    bench.add_argument("--seed", type=int, default=0, help="Semente dos dados sintéticos")
+    bench.add_argument("--json", dest="json_path", help="Grava os resultados em JSON")
+    bench.set_defaults(func=cmd_bench)
+
+    serve = subparsers.add_parser("serve", help="Serviço local de agregados compartilhado pelos dashboards")
+    _add_output_options(serve)
+    serve.add_argument("--dataset", help="CSV, padrão glob ou diretório de origem (padrão: diretório de saída)")
+    serve.add_argument("--host", default="127.0.0.1", help="Endereço de escuta")
+    serve.add_argument("--port", type=int, default=8765, help="Porta HTTP")
+    serve.add_argument("--refresh-interval", type=float, default=30, help="Segundos entre verificações de dados novos")
+    serve.add_argument("--cache-size", type=int, default=256, help="Respostas mantidas no cache")
+    serve.set_defaults(func=cmd_serve)
+
+    generate = subparsers.add_parser("generate", help="Gera um CSV de pedidos sintéticos no formato dos dashboards")
+    generate.add_argument("rows", type=int, help="Quantidade de pedidos")
+    generate.add_argument("-o", "--output", help="Arquivo de destino (padrão: synthetic_<n>_<seed>.csv)")
+    generate.add_argument("--seed", type=int, default=0, help="Semente aleatória")
+    generate.add_argument("--start", help="Data inicial AAAA-MM-DD (padrão: 2 anos antes do fim)")
+    generate.add_argument("--end", help="Data final AAAA-MM-DD (padrão: hoje)")
+    generate.add_argument("--chunk-size", type=int, default=1_000_000, help="Linhas geradas por bloco")
+    generate.set_defaults(func=cmd_generate)
+
+    return parser
+
+# Configuração final: padrões < variáveis de ambiente < flags
+def _config_from_args(args, defaults=None):
+    overrides = {name: getattr(args, name, None) for name in Config.__dataclass_fields__}
+    return Config.from_env(defaults, **overrides)
+
+def _setup_logging(config):
+    from .logs import setup_logging
+    setup_logging(config.log_level, config.output_path(config.log_file) if config.log_file else None)
+
+def _preflight(config, args):
+    if args.dry_run:
+        print(config.describe())
+        return 0
+    if not config.api_token:
+        print("Token da API não informado: use --token ou a variável de ambiente MAGIS5_API_TOKEN",
+              file=sys.stderr)
+        return 2
+    if args.check:
+        from .api import test_api_connection
+        _setup_logging(config.with_overrides(log_file=""))
+        return 0 if test_api_connection(config) else 1
+    return None
+
+def cmd_extract(args):
+    config = _config_from_args(args)
+    status = _preflight(config, args)
+    if status is not None:
+        return status
+
+    _setup_logging(config)
+    from .extractor import run_extract
+    return 0 if run_extract(config, write_csv=not args.no_csv) else 1
+
+def cmd_incremental(args):
+    config = _config_from_args(args, {"date_search_type": INCREMENTAL_DATE_SEARCH_TYPE})
+    status = _preflight(config, args)
+    if status is not None:
+        return status
+
+    _setup_logging(config)
+    from .extractor import run_incremental
+    # --since explícito prevalece sobre o watermark gravado
+    return 0 if run_incremental(config, dataset=args.dataset, since=args.timestamp_from) else 1
+
+def cmd_export(args):
+    config = _config_from_args(args)
+    _setup_logging(config)
+    from .extractor import latest_dataset, run_export
+
+    source = args.source or latest_dataset(config.output_dir)
+    if not source:
+        print("Nenhum CSV encontrado para exportar", file=sys.stderr)
+        return 1
+    return 0 if run_export(source, args.output) else 1
+
+def cmd_bench(args):
+    from . import bench
+    if args.suite == "dashboards":
+        bench.run_dashboards(rows=args.rows, dashboards=args.dashboards, repeat=args.repeat or 1,
+                             data_dir=args.data_dir, charts=not args.no_charts, seed=args.seed,
+                             json_path=args.json_path)
+    else:
+        bench.run_startup(repeat=args.repeat or 5)
+    return 0
+
+def cmd_serve(args):
+    config = _config_from_args(args)
+    _setup_logging(config)
+    from .service import serve
+
+    serve(args.dataset or config.output_dir, host=args.host, port=args.port,
+          cache_size=args.cache_size, refresh_interval=args.refresh_interval)
+    return 0
+
+def cmd_generate(args):
+    from .synthetic import default_filename, write_orders_csv
+
+    output = args.output or default_filename(args.rows, args.seed)
+    write_orders_csv(output, args.rows, seed=args.seed, start=args.start, end=args.end, chunk_size=args.chunk_size)
+    print(output)
+    return 0
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
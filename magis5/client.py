@@ -0,0 +1,61 @@
+import io
+import json
+from urllib.parse import urlencode
+from urllib.request import urlopen
+
+import pandas as pd
+
+from .service import FILTER_PARAMS
+
+# Cliente do serviço de agregados (magis5.service), com os mesmos métodos de consulta
+# do LiveOrders para que os dashboards usem um ou outro sem mudanças.
+
+def _frame(payload):
+    return pd.DataFrame(payload["data"], columns=payload["columns"])
+
+def _timestamp(value):
+    return pd.Timestamp(value) if value else pd.NaT
+
+class ServiceClient:
+    def __init__(self, url, timeout=30):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    def _get(self, path, start=None, end=None, **filters):
+        params = [("inicio", str(start)) if start else None, ("fim", str(end)) if end else None]
+        params = [param for param in params if param]
+        for param, name in FILTER_PARAMS.items():
+            params.extend((param, value) for value in filters.get(name) or [])
+        with urlopen(f"{self.url}{path}?{urlencode(params)}", timeout=self.timeout) as response:
+            return response.read()
+
+    def _json(self, path, *args, **kwargs):
+        return json.loads(self._get(path, *args, **kwargs))
+
+    def info(self):
+        info = self._json("/saude")
+        info["atualizado"] = _timestamp(info["atualizado"])
+        return info
+
+    def date_range(self):
+        interval = self._json("/intervalo")
+        return _timestamp(interval["inicio"]), _timestamp(interval["fim"])
+
+    def sales_summary(self, start=None, end=None):
+        return {name: _frame(payload) for name, payload in self._json("/resumo/vendas", start, end).items()}
+
+    def panel_summary(self, start=None, end=None, produtos=None, canais=None, status=None, skus=None):
+        payload = self._json("/resumo/painel", start, end, produtos=produtos, canais=canais, status=status, skus=skus)
+        resumo = {name: _frame(value) for name, value in payload.items() if name != "kpis"}
+        resumo["vendas_dia"]["dateCreated"] = pd.to_datetime(resumo["vendas_dia"]["dateCreated"])
+        resumo["kpis"] = payload["kpis"]
+        return resumo
+
+    def options(self, start=None, end=None):
+        return self._json("/opcoes", start, end)
+
+    def orders(self, start=None, end=None, produtos=None, canais=None, status=None, skus=None):
+        body = self._get("/pedidos.csv", start, end, produtos=produtos, canais=canais, status=status, skus=skus)
+        df = pd.read_csv(io.BytesIO(body), sep=";", encoding="utf-8", dtype={"id": str})
+        df["dateCreated"] = pd.to_datetime(df["dateCreated"], errors="coerce")
+        return df
@@ -0,0 +1,119 @@
+import os
+import time
+from dataclasses import dataclass, field, fields, replace
+from datetime import datetime
+
+# Valores padrão (podem ser sobrescritos por variáveis de ambiente MAGIS5_* ou flags da CLI)
+DEFAULT_API_BASE_URL = "https://app.magis5.com.br/v1"
+DEFAULT_API_TOKEN = ""  # Obrigatório: --token ou MAGIS5_API_TOKEN
+DEFAULT_TIMESTAMP_FROM = 1577836800  # 01/01/2020
+# A extração incremental busca pela data de atualização: com "created", pedidos criados
+# antes do watermark que depois mudam de status (pago, enviado, cancelado) nunca voltam
+INCREMENTAL_DATE_SEARCH_TYPE = "updated"
+
+# Formato do CSV lido pelos dashboards (relatorio_magis5_<n>_registros_<data>.csv)
+DATASET_PATTERN = "relatorio_magis5_*_registros_*.csv"
+DATASET_CSV_OPTIONS = {"sep": ";", "encoding": "latin1"}
+DEFAULT_STATE_FILE = "magis5_estado.json"
+
+# Converte data (AAAA-MM-DD, ISO ou epoch em segundos) para timestamp
+def parse_timestamp(value):
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    value = str(value).strip()
+    if value.isdigit():
+        return int(value)
+    return int(datetime.fromisoformat(value).timestamp())
+
+def _env(name, default=None):
+    value = os.environ.get(f"MAGIS5_{name}")
+    return default if value is None or value == "" else value
+
+@dataclass(frozen=True)
+class Config:
+    # API
+    api_base_url: str = DEFAULT_API_BASE_URL
+    api_token: str = DEFAULT_API_TOKEN
+    timeout: float = 30
+
+    # Período e paginação
+    date_search_type: str = "created"
+    timestamp_from: int = DEFAULT_TIMESTAMP_FROM
+    timestamp_to: int = field(default_factory=lambda: int(time.time()))
+    page_limit: int = 50
+    max_pages: int = 0  # 0 = sem limite
+
+    # Retry e paralelismo
+    max_retries: int = 5
+    backoff_factor: float = 2
+    initial_sleep: float = 1
+    max_workers: int = 10
+
+    # Saídas
+    output_dir: str = "."
+    excel_file: str = "relatorio_magis5_v5.0.xlsx"
+    state_file: str = DEFAULT_STATE_FILE
+
+    # Logs
+    log_file: str = "magis5_log.txt"
+    log_level: str = "INFO"
+
+    @property
+    def headers(self):
+        return {
+            "X-MAGIS5-APIKEY": self.api_token,
+            "Accept": "application/json"
+        }
+
+    @property
+    def params_simple(self):
+        return {
+            "dateSearchType": self.date_search_type,
+            "enableLink": "true",
+            "limit": str(self.page_limit),
+            "page": "1",
+            "status": "all",
+            "structureType": "simple",
+            "timestampFrom": str(self.timestamp_from),
+            "timestampTo": str(self.timestamp_to)
+        }
+
+    def output_path(self, filename):
+        return os.path.join(self.output_dir, filename)
+
+    # Configuração a partir das variáveis de ambiente MAGIS5_<CAMPO>; `defaults` substitui
+    # os padrões da classe (precedência: defaults < ambiente < overrides)
+    @classmethod
+    def from_env(cls, defaults=None, **overrides):
+        values = dict(defaults or {})
+        for f in fields(cls):
+            raw = _env(f.name.upper())
+            if raw is None:
+                continue
+            if f.name in ("timestamp_from", "timestamp_to"):
+                values[f.name] = parse_timestamp(raw)
+            elif f.type in ("int", int):
+                values[f.name] = int(raw)
+            elif f.type in ("float", float):
+                values[f.name] = float(raw)
+            else:
+                values[f.name] = raw
+        values.update({k: v for k, v in overrides.items() if v is not None})
+        return cls(**values)
+
+    def with_overrides(self, **overrides):
+        return replace(self, **{k: v for k, v in overrides.items() if v is not None})
+
+    # Representação segura para logs e --dry-run (sem o token completo)
+    def describe(self):
+        lines = []
+        for f in fields(self):
+            value = getattr(self, f.name)
+            if f.name == "api_token":
+                value = f"{value[:4]}…" if value else "(vazio)"
+            elif f.name in ("timestamp_from", "timestamp_to"):
+                value = f"{value} ({datetime.fromtimestamp(value):%Y-%m-%d %H:%M})"
+            lines.append(f"{f.name} = {value}")
+        return "\n".join(lines)
@@ -0,0 +1,226 @@
+import numpy as np
+import pandas as pd
+
+from .config import DATASET_CSV_OPTIONS
+
+# Funções de carga, filtro e agregação usadas pelos dashboards Streamlit.
+# Ficam aqui (e não nos scripts) para poderem ser reutilizadas e medidas pelo benchmark.
+
+# Colunas usadas pelo streamlit03_ploty3d.py
+PANEL_COLUMNS = ["dateCreated", "item_title", "item_sku", "channel", "status",
+                 "item_quantity", "item_price", "item_cost", "totalValue"]
+# Colunas carregadas pelo serviço compartilhado (atende aos três dashboards)
+SERVICE_COLUMNS = PANEL_COLUMNS + ["payment_type"]
+MONEY_COLUMNS = ["item_price", "item_cost", "totalValue"]
+# Colunas de baixa cardinalidade carregadas como category (menos memória e groupby mais rápido)
+CATEGORY_COLUMNS = ["channel", "status", "payment_type", "item_title", "item_sku"]
+
+# Rollups diários mantidos pelo LiveOrders: nome -> dimensão agrupada junto com o dia
+ROLLUPS = {"canal": "channel", "pagamento": "payment_type", "status": "status",
+           "produto": "item_title", "sku": "item_sku"}
+ROLLUP_MEASURES = ["pedidos", "totalValue", "item_quantity", "lucro"]
+
+# Converte colunas monetárias ("12,50", "R$ 12,50") para número
+def parse_money(series):
+    if pd.api.types.is_numeric_dtype(series):
+        return series
+    text = series.astype(str)
+    # Caminho rápido para valores já limpos; a regex só roda nos que falharem
+    values = pd.to_numeric(text.str.replace(",", ".", regex=False), errors="coerce")
+    retry = values.isna() & series.notna()
+    if retry.any():
+        values[retry] = pd.to_numeric(
+            text[retry].str.replace(",", ".").str.replace(r"[^\d\.]", "", regex=True),
+            errors="coerce"
+        )
+    return values
+
+# Conversões e limpeza de dados
+def clean_orders(df):
+    df["dateCreated"] = pd.to_datetime(df["dateCreated"], errors="coerce")
+    for col in MONEY_COLUMNS:
+        if col in df.columns:
+            df[col] = parse_money(df[col])
+    return df
+
+# Leitura do CSV exportado pelo extrator (aceita caminho ou arquivo aberto)
+def load_orders(path, columns=None, dtype=None, **read_options):
+    dtypes = {col: "category" for col in CATEGORY_COLUMNS if columns is None or col in columns}
+    dtypes.update(dtype or {})
+    # decimal="," deixa o parser C converter os valores monetários já limpos
+    df = pd.read_csv(path, usecols=columns, dtype=dtypes, decimal=",", **{**DATASET_CSV_OPTIONS, **read_options})
+    return clean_orders(df)
+
+# Máscara de datas [start, end] por dia, respeitando o fuso da coluna
+def date_mask(dates, start=None, end=None):
+    mask = np.ones(len(dates), dtype=bool)
+    tz = dates.dt.tz
+    if start is not None:
+        lower = pd.Timestamp(start)
+        mask &= (dates >= (lower.tz_localize(tz) if tz else lower)).to_numpy()
+    if end is not None:
+        upper = pd.Timestamp(end) + pd.Timedelta(days=1)
+        mask &= (dates < (upper.tz_localize(tz) if tz else upper)).to_numpy()
+    return mask
+
+# Filtros dos dashboards (listas vazias ou None não filtram)
+def filter_orders(df, start=None, end=None, produtos=None, canais=None, status=None, skus=None):
+    mask = date_mask(df["dateCreated"], start, end)
+    for col, values in (("item_title", produtos), ("channel", canais), ("status", status), ("item_sku", skus)):
+        if values:
+            mask &= df[col].isin(values).to_numpy()
+    return df[mask]
+
+# Valores distintos ordenados de uma coluna (opções dos multiselects)
+def options(df, col):
+    values = df[col].dropna()
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.cat.remove_unused_categories().cat.categories
+    return sorted(values.unique())
+
+# Os agregados abaixo aceitam tanto o frame de pedidos quanto o dict de rollups
+# diários de build_rollups (já filtrado por data com filter_rollups)
+def _source(df, rollup):
+    return df[rollup] if isinstance(df, dict) else df
+
+def _profit(df):
+    return df["lucro"] if "lucro" in df.columns else df["item_price"] - df["item_cost"]
+
+# Rótulos como texto: gráficos tratam colunas category como eixo com todas as categorias
+def _plain_labels(series):
+    series.index = series.index.astype(object)
+    return series
+
+# Contagem por coluna, em ordem decrescente (equivalente a value_counts)
+def _counts(df, col, labels):
+    grouped = df.groupby(col, observed=True)
+    counts = grouped["pedidos"].sum() if "pedidos" in df.columns else grouped.size()
+    counts = _plain_labels(counts.sort_values(ascending=False)).reset_index()
+    counts.columns = labels
+    return counts
+
+def _top(df, col, values, n):
+    top = df.groupby(col, observed=True)[values].sum().sort_values(ascending=False).head(n)
+    return _plain_labels(top).reset_index()
+
+# Prefixo do canal ("MERCADOLIVRE-FULL" -> "MERCADOLIVRE"), calculado uma vez por categoria
+def short_channel(channel):
+    channel = channel.astype("category")
+    prefixes = channel.cat.categories.astype(str).str.split("-").str[0].to_numpy(dtype=object)
+    labels = np.append(prefixes, "nan")  # código -1 (NaN) aponta para o último rótulo
+    codes, uniques = pd.factorize(labels)
+    return pd.Series(pd.Categorical.from_codes(codes[channel.cat.codes.to_numpy()], uniques), index=channel.index)
+
+# Agregados do streamlit01.py / streamlit02.py
+def payment_counts(df):
+    return _counts(_source(df, "pagamento"), "payment_type", ["Tipo de Pagamento", "Quantidade"])
+
+def status_counts(df):
+    return _counts(_source(df, "status"), "status", ["Status", "Quantidade"])
+
+def top_products_by_quantity(df, n=10):
+    return _top(_source(df, "produto"), "item_title", "item_quantity", n)
+
+def top_products_by_profit(df, n=10):
+    df = _source(df, "produto")
+    lucro = df[["item_title"]].assign(lucro_unitario=_profit(df))
+    return _top(lucro, "item_title", "lucro_unitario", n)
+
+def sales_summary(df):
+    return {
+        "pagamento": payment_counts(df),
+        "produtos": top_products_by_quantity(df),
+        "status": status_counts(df),
+        "lucro": top_products_by_profit(df),
+    }
+
+# Agregados do streamlit03_ploty3d.py
+def kpis(df):
+    df = _source(df, "canal")
+    vendas_total = df["totalValue"].sum()
+    quantidade_total = df["item_quantity"].sum()
+    lucro_total = _profit(df).sum()
+    return {
+        "vendas_total": vendas_total,
+        "quantidade_total": quantidade_total,
+        "ticket_medio": vendas_total / quantidade_total if quantidade_total else 0,
+        "lucro_total": lucro_total,
+        "margem_media": (lucro_total / vendas_total * 100) if vendas_total else 0,
+    }
+
+# Mês (AAAA-MM) e canal resumido; o mês é convertido para texto só depois do groupby
+def _period_frame(df):
+    return pd.DataFrame({
+        "mes": df["dateCreated"].dt.to_period("M"),
+        "canal_resumido": short_channel(df["channel"]),
+        "totalValue": df["totalValue"],
+        "item_quantity": df["item_quantity"],
+    }, index=df.index)
+
+def _month_to_str(frame):
+    frame["mes"] = frame["mes"].astype(str)
+    return frame
+
+def add_period_columns(df):
+    return df.assign(mes=df["dateCreated"].dt.to_period("M").astype(str),
+                     canal_resumido=short_channel(df["channel"]).astype(str))
+
+def sales_by_day(df):
+    return df.groupby(df["dateCreated"].dt.normalize())["totalValue"].sum().reset_index()
+
+def panel_summary(df):
+    df = _source(df, "canal")
+    periods = _period_frame(df)
+    by_month = periods.groupby("mes")["totalValue"].sum().reset_index()
+    by_channel = (periods.groupby("canal_resumido", observed=True)["item_quantity"].sum()
+                  .reset_index().sort_values(by="item_quantity", ascending=False))
+    channel_month = (periods.groupby(["canal_resumido", "mes"], observed=True)[["totalValue", "item_quantity"]]
+                     .sum().reset_index())
+    ticket = (channel_month.assign(ticket_medio=channel_month["totalValue"] / channel_month["item_quantity"])
+              [["mes", "canal_resumido", "ticket_medio"]]
+              .sort_values(by="ticket_medio", ascending=False))
+    return {
+        "kpis": kpis(df),
+        "vendas_dia": sales_by_day(df),
+        "vendas_mes": _month_to_str(by_month),
+        "quantidade_canal": by_channel,
+        "canal_mes": _month_to_str(channel_month[["canal_resumido", "mes", "totalValue"]].copy()),
+        "ticket_canal_mes": _month_to_str(ticket),
+    }
+
+# Rollups diários (dia x dimensão) com contagem e somas, suficientes para todos os
+# agregados acima quando o único filtro é o de datas
+def build_rollups(df):
+    base = pd.DataFrame({
+        "dateCreated": df["dateCreated"].dt.normalize(),
+        "pedidos": np.ones(len(df), dtype="int64"),
+        "totalValue": df["totalValue"] if "totalValue" in df.columns else np.nan,
+        "item_quantity": df["item_quantity"] if "item_quantity" in df.columns else 0,
+        "lucro": _profit(df) if {"item_price", "item_cost"} <= set(df.columns) else np.nan,
+    }, index=df.index)
+    rollups = {}
+    for name, col in ROLLUPS.items():
+        if col not in df.columns:
+            continue
+        grouped = base.assign(**{col: df[col]}).groupby(["dateCreated", col], observed=True, dropna=False)
+        frame = grouped[ROLLUP_MEASURES].sum(min_count=1).reset_index()
+        rollups[name] = frame[frame["dateCreated"].notna()].reset_index(drop=True)
+    return rollups
+
+# Soma os rollups de pedidos novos e subtrai os de pedidos substituídos
+def update_rollups(current, added, removed=None):
+    result = {}
+    for name, frame in current.items():
+        parts = [frame, added.get(name)]
+        if removed and name in removed:
+            negative = removed[name].copy()
+            negative[ROLLUP_MEASURES] = -negative[ROLLUP_MEASURES]
+            parts.append(negative)
+        merged = pd.concat([part for part in parts if part is not None], ignore_index=True)
+        merged = (merged.groupby(["dateCreated", ROLLUPS[name]], observed=True, dropna=False)[ROLLUP_MEASURES]
+                  .sum(min_count=1).reset_index())
+        result[name] = merged[merged["pedidos"] != 0].reset_index(drop=True)
+    return result
+
+def filter_rollups(rollups, start=None, end=None):
+    return {name: frame[date_mask(frame["dateCreated"], start, end)] for name, frame in rollups.items()}
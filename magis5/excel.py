@@ -0,0 +1,104 @@
+import math
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+import xlsxwriter
+
+# Escrita de Excel em modo constant_memory do xlsxwriter: cada linha vai para o
+# arquivo temporário da planilha assim que a próxima começa, então o workbook não
+# fica inteiro em memória. Planilhas que passam do limite de linhas do Excel
+# continuam em "<nome>_2", "<nome>_3", ... com o mesmo cabeçalho.
+
+EXCEL_MAX_ROWS = 1_048_576
+SHEET_NAME_MAX = 31
+
+class SheetStream:
+    def __init__(self, writer, name, columns):
+        self.writer = writer
+        self.name = name
+        self.columns = list(columns)
+        self.rows = 0
+        self.sheets = []
+        self._worksheet = None
+        self._row = 0
+
+    def _sheet_name(self):
+        suffix = f"_{len(self.sheets) + 1}" if self.sheets else ""
+        return f"{self.name[:SHEET_NAME_MAX - len(suffix)]}{suffix}"
+
+    # Nova planilha com cabeçalho quando a atual chega ao limite
+    def _next_sheet(self):
+        name = self._sheet_name()
+        self._worksheet = self.writer.workbook.add_worksheet(name)
+        self.sheets.append(name)
+        for col, title in enumerate(self.columns):
+            self._worksheet.write_string(0, col, str(title))
+        self._row = 1
+
+    def write_row(self, values):
+        if self._worksheet is None or self._row >= self.writer.max_rows:
+            self._next_sheet()
+        worksheet, row = self._worksheet, self._row
+        for col, value in enumerate(values):
+            # Vazios (None, NaN, "") não geram célula, equivalente ao antigo fillna("")
+            if value is None or (isinstance(value, str) and not value):
+                continue
+            if isinstance(value, str):
+                worksheet.write_string(row, col, value)
+            elif isinstance(value, (bool, np.bool_)):
+                worksheet.write_boolean(row, col, bool(value))
+            elif isinstance(value, (int, float, np.integer, np.floating)):
+                if isinstance(value, (float, np.floating)) and math.isnan(value):
+                    continue
+                worksheet.write_number(row, col, value.item() if isinstance(value, np.generic) else value)
+            elif isinstance(value, (datetime, date, np.datetime64)):
+                if value != value:  # NaT
+                    continue
+                worksheet.write_datetime(row, col, value if not isinstance(value, np.datetime64)
+                                         else value.astype("datetime64[us]").item(), self.writer.date_format)
+            elif pd.api.types.is_scalar(value) and pd.isna(value):
+                continue  # pd.NA das colunas Int64/string
+            else:
+                worksheet.write_string(row, col, str(value))
+        self._row += 1
+        self.rows += 1
+
+    def write_rows(self, rows):
+        for values in rows:
+            self.write_row(values)
+
+    def write_frame(self, df):
+        self.write_rows(df.itertuples(index=False, name=None))
+
+class StreamingExcelWriter:
+    def __init__(self, filename, max_rows=EXCEL_MAX_ROWS):
+        self.filename = filename
+        self.max_rows = max_rows
+        self.workbook = xlsxwriter.Workbook(filename, {
+            "constant_memory": True,
+            "strings_to_numbers": False,
+            "strings_to_formulas": False,
+            "strings_to_urls": False,
+            "nan_inf_to_errors": True,
+            "remove_timezone": True,
+        })
+        self.date_format = self.workbook.add_format({"num_format": "yyyy-mm-dd hh:mm:ss"})
+
+    def sheet(self, name, columns):
+        return SheetStream(self, name, columns)
+
+    # Grava um DataFrame inteiro; o SheetStream retornado traz registros e planilhas usadas
+    def write_dataframe(self, name, df):
+        stream = self.sheet(name, df.columns)
+        stream.write_frame(df)
+        return stream
+
+    def close(self):
+        self.workbook.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,481 @@
+import glob
+import json
+import logging
+import os
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+import pandas as pd
+
+from .api import fetch_complete_order, fetch_simple_orders, safe_get, test_api_connection
+from .config import DATASET_CSV_OPTIONS, DATASET_PATTERN
+from .excel import StreamingExcelWriter
+
+EXPORT_CHUNK_SIZE = 100_000
+
+# Processa pedidos simples
+def process_simple_orders(orders):
+    if not orders:
+        logging.warning("Nenhum pedido simples para processar")
+        return pd.DataFrame()
+
+    processed_data = []
+    for order in orders:
+        if not isinstance(order, dict):
+            logging.warning(f"Pedido em formato inválido: {type(order)}")
+            continue
+
+        # CORREÇÃO: Usar completeOrderNumber como ID quando disponível
+        order_id = order.get("id", "")
+        if not order_id and "completeOrderNumber" in order:
+            order_id = order.get("completeOrderNumber", "")
+
+        # Se ainda não tiver ID, tentar extrair da URL do link
+        if not order_id and "links" in order and order["links"]:
+            for link in order["links"]:
+                if link.get("rel") == "self" and link.get("href", "").startswith("/orders/"):
+                    order_id = link.get("href").replace("/orders/", "")
+                    break
+
+        if not order_id:
+            logging.warning("Pedido sem ID encontrado, ignorando")
+            continue
+
+        # Extrair dados básicos com valores padrão para campos obrigatórios
+        order_data = {
+            "id": order_id,
+            "externalId": order.get("externalId", ""),
+            "status": order.get("status", ""),
+            "dateCreated": order.get("dateCreated", ""),
+            "storeId": order.get("storeId", ""),
+            "channel": order.get("channel", ""),
+            "totalValue": order.get("totalValue", 0)
+        }
+
+        # Processar links se existirem
+        links = order.get("links", [])
+        if links:
+            for link in links:
+                if not isinstance(link, dict):
+                    continue
+
+                link_data = order_data.copy()
+                link_data.update({
+                    "Rel": link.get("rel", ""),
+                    "Tipo do Link": link.get("type", ""),
+                    "URL do Link": link.get("href", "")
+                })
+                processed_data.append(link_data)
+        else:
+            # Se não houver links, adicionar entrada com campos de link vazios
+            order_data.update({
+                "Rel": "",
+                "Tipo do Link": "",
+                "URL do Link": ""
+            })
+            processed_data.append(order_data)
+
+    # Criar DataFrame e garantir que não haja valores NaN
+    df = pd.DataFrame(processed_data)
+    # Converter valores NaN para strings vazias
+    df = df.fillna("")
+
+    logging.info(f"Processados {len(processed_data)} registros de pedidos simples")
+    return df
+
+# Processa pedidos completos
+def process_complete_order(order):
+    if not order:
+        return {}
+
+    # Garantir que há um ID de pedido
+    order_id = safe_get(order, ["id"], "")
+    if not order_id:
+        logging.warning("Pedido completo sem ID válido")
+        return {}
+
+    # Extrair dados de forma segura
+    shipping_address = safe_get(order, ["shipping", "receiverAddress"], {})
+
+    # Processar informações de pagamento
+    payment_info = {}
+    payments = safe_get(order, ["payments"], [])
+    if payments and isinstance(payments, list) and len(payments) > 0:
+        payment = payments[0]
+        payment_info = {
+            "payment_status": safe_get(payment, ["status"], ""),
+            "payment_type": safe_get(payment, ["payment_type"], ""),
+            "payment_installments": safe_get(payment, ["installments"], 0),
+            "payment_amount": safe_get(payment, ["transaction_amount"], 0)
+        }
+
+    # Processar informações de itens
+    item_info = {}
+    items = safe_get(order, ["order_items"], [])
+    if items and isinstance(items, list) and len(items) > 0:
+        item = items[0]
+        item_info = {
+            "item_title": safe_get(item, ["item", "title"], ""),
+            "item_sku": safe_get(item, ["item", "seller_custom_field"], ""),
+            "item_quantity": safe_get(item, ["quantity"], 0),
+            "item_price": safe_get(item, ["unit_price"], 0),
+            "item_cost": safe_get(item, ["cost"], 0)
+        }
+
+    # Montar objeto de pedido completo com valores padrão para evitar NaN
+    processed_order = {
+        # Dados básicos
+        "id": order_id,
+        "externalId": safe_get(order, ["externalId"], ""),
+        "status": safe_get(order, ["status"], ""),
+        "dateCreated": safe_get(order, ["dateCreated"], ""),
+        "dateLastUpdated": safe_get(order, ["dateLastUpdated"], ""),
+        "totalValue": safe_get(order, ["totalValue"], 0),
+        "storeId": safe_get(order, ["storeId"], ""),
+        "channel": safe_get(order, ["channel"], ""),
+
+        # Endereço de entrega
+        "shipping_street": shipping_address.get("street", ""),
+        "shipping_number": shipping_address.get("number", ""),
+        "shipping_city": shipping_address.get("city", ""),
+        "shipping_state": shipping_address.get("state", ""),
+        "shipping_zipcode": shipping_address.get("zipcode", ""),
+
+        # Informações de envio
+        "shipping_cost": safe_get(order, ["shipping", "cost"], 0),
+        "shipping_type": safe_get(order, ["shipping", "logistic_type"], ""),
+        "shipping_tracking": safe_get(order, ["shipping", "logistic", "logisticId"], ""),
+
+        # Adicionar informações de pagamento e item
+        **payment_info,
+        **item_info
+    }
+
+    # Remover valores None
+    return {k: (v if v is not None else "") for k, v in processed_order.items()}
+
+# Extrai IDs de pedidos a partir dos links
+def extract_order_ids_from_links(simple_orders_df):
+    if 'URL do Link' not in simple_orders_df.columns:
+        return []
+
+    order_ids = []
+    for url in simple_orders_df['URL do Link'].dropna():
+        if isinstance(url, str) and url.startswith('/orders/'):
+            order_id = url.replace('/orders/', '')
+            order_ids.append(order_id)
+
+    return list(set(order_ids))  # Remover duplicatas
+
+# Busca todos os pedidos completos em paralelo. Retorna (pedidos, ids_com_falha): os
+# pedidos que falharam entram apenas como {"id": ...} para manter o ID no merge
+def fetch_all_complete_orders(config, simple_orders_df):
+    if simple_orders_df.empty:
+        logging.warning("DataFrame de pedidos simples vazio")
+        return [], []
+
+    # CORREÇÃO: Extrair IDs dos links quando não houver coluna 'id'
+    if 'id' not in simple_orders_df.columns or simple_orders_df['id'].isna().all():
+        order_ids = extract_order_ids_from_links(simple_orders_df)
+        logging.info(f"Extraídos {len(order_ids)} IDs de pedidos a partir dos links")
+    else:
+        # Garantir que são strings e remover duplicatas
+        order_ids = [str(oid).strip() for oid in simple_orders_df['id'].dropna().unique() if str(oid).strip()]
+
+    if not order_ids:
+        logging.warning("Nenhum ID de pedido válido encontrado")
+        return [], []
+
+    logging.info(f"Buscando detalhes para {len(order_ids)} pedidos...")
+
+    complete_orders_list = []
+    failed_ids = []
+    with ThreadPoolExecutor(max_workers=config.max_workers) as executor:
+        future_to_order = {executor.submit(fetch_complete_order, config, order_id): order_id for order_id in order_ids}
+
+        completed = 0
+        for future in as_completed(future_to_order):
+            order_id = future_to_order[future]
+            completed += 1
+
+            if completed % 10 == 0 or completed == len(order_ids):
+                logging.info(f"Progresso: {completed}/{len(order_ids)} pedidos ({completed/len(order_ids)*100:.1f}%)",
+                             extra={"sample_key": None if completed == len(order_ids) else "progresso"})
+
+            try:
+                order = future.result()
+                if order and isinstance(order, dict) and 'id' in order:
+                    processed_order = process_complete_order(order)
+                    complete_orders_list.append(processed_order)
+                    logging.debug(f"Pedido {order_id} processado com sucesso")
+                else:
+                    # Adicionar registro mínimo para manter o ID no merge
+                    complete_orders_list.append({"id": order_id})
+                    failed_ids.append(order_id)
+                    logging.warning(f"Pedido {order_id} retornou dados incompletos ou inválidos")
+            except Exception as e:
+                logging.error(f"Erro ao processar pedido {order_id}: {e}")
+                complete_orders_list.append({"id": order_id})
+                failed_ids.append(order_id)
+
+    if failed_ids:
+        logging.error(f"{len(failed_ids)} pedidos sem dados completos: {', '.join(sorted(failed_ids))}")
+    logging.info(f"Total de {len(complete_orders_list)} pedidos completos processados")
+    return complete_orders_list, failed_ids
+
+# Remove as linhas mínimas ({"id": ...}) dos pedidos cuja busca falhou
+def _without_failed(df_complete, failed_ids):
+    if not failed_ids or df_complete.empty:
+        return df_complete
+    return df_complete[~df_complete["id"].isin(set(failed_ids))]
+
+# Correlaciona pedidos simples e completos
+def correlate_orders(simple_df, complete_orders_list):
+    if simple_df.empty:
+        logging.warning("DataFrame de pedidos simples vazio para correlação")
+        return pd.DataFrame(), pd.DataFrame()
+
+    # Garantir que temos dados completos para processar
+    if not complete_orders_list:
+        logging.warning("Lista de pedidos completos vazia")
+        df_complete = pd.DataFrame()
+        # Retornar só os dados simples se não tiver dados completos
+        return df_complete, simple_df
+
+    # Criar DataFrame de pedidos completos
+    df_complete = pd.DataFrame(complete_orders_list)
+
+    # Verificar consistência dos dados
+    if 'id' not in df_complete.columns:
+        logging.error("DataFrame de pedidos completos não contém coluna 'id'")
+        return df_complete, simple_df
+
+    # CORREÇÃO: Se não houver coluna 'id' em simple_df, criar a partir da URL do Link
+    if 'id' not in simple_df.columns or simple_df['id'].isna().all():
+        logging.info("Criando coluna 'id' a partir da URL do Link")
+        simple_df['id'] = simple_df['URL do Link'].apply(
+            lambda x: x.replace('/orders/', '') if isinstance(x, str) and x.startswith('/orders/') else ""
+        )
+
+    # Garantir que IDs são strings para evitar problemas de tipos no merge
+    simple_df['id'] = simple_df['id'].astype(str)
+    df_complete['id'] = df_complete['id'].astype(str)
+
+    logging.info(f"Correlacionando {len(simple_df)} pedidos simples com {len(df_complete)} pedidos completos")
+
+    # Fazer merge dos dados
+    try:
+        combined_df = pd.merge(simple_df, df_complete, on='id', how='left', suffixes=('_simples', '_completos'))
+        logging.info(f"Correlação concluída: {len(combined_df)} registros")
+        return df_complete, combined_df
+    except Exception as e:
+        logging.error(f"Erro durante a correlação de dados: {e}")
+        return df_complete, simple_df
+
+# Salva dados em Excel (modo constant_memory; planilhas acima do limite de linhas do
+# Excel continuam em "<nome>_2", "<nome>_3", ...)
+def save_to_excel(simple_df, complete_df, combined_df, filename="relatorio_magis5_v5.0.xlsx"):
+    try:
+        with StreamingExcelWriter(filename) as writer:
+            for sheet_name, df in (("Simples", simple_df), ("Completo", complete_df), ("Combinado", combined_df)):
+                if df.empty:
+                    continue
+                # NaN vira célula vazia na escrita, sem cópia do DataFrame com fillna
+                sheet = writer.write_dataframe(sheet_name, df)
+                logging.info(f"Planilha '{sheet_name}' salva com {sheet.rows} registros"
+                             + (f" em {len(sheet.sheets)} planilhas" if len(sheet.sheets) > 1 else ""))
+
+        logging.info(f"Dados salvos em {filename}")
+        return True
+    except Exception as e:
+        logging.error(f"Erro ao salvar Excel: {e}")
+        return False
+
+# Salva os pedidos completos no CSV lido pelos dashboards
+def save_dataset_csv(complete_df, output_dir="."):
+    filename = os.path.join(
+        output_dir, f"relatorio_magis5_{len(complete_df)}_registros_{datetime.now():%Y-%m-%d_%H-%M-%S}.csv"
+    )
+    try:
+        complete_df.to_csv(filename, index=False, decimal=",", errors="replace", **DATASET_CSV_OPTIONS)
+        logging.info(f"CSV dos dashboards salvo em {filename}")
+        return filename
+    except Exception as e:
+        logging.error(f"Erro ao salvar CSV: {e}")
+        return None
+
+# Acrescenta pedidos ao final de um CSV existente (sem reescrever o arquivo)
+def append_dataset_csv(complete_df, filename):
+    try:
+        columns = pd.read_csv(filename, nrows=0, **DATASET_CSV_OPTIONS).columns
+        missing = [col for col in complete_df.columns if col not in columns]
+        if missing:
+            logging.warning(f"Colunas ignoradas por não existirem em {filename}: {missing}")
+        complete_df.reindex(columns=columns).to_csv(
+            filename, mode="a", header=False, index=False, decimal=",", errors="replace", **DATASET_CSV_OPTIONS
+        )
+        logging.info(f"{len(complete_df)} pedidos acrescentados em {filename}")
+        return True
+    except Exception as e:
+        logging.error(f"Erro ao acrescentar dados em {filename}: {e}")
+        return False
+
+# CSV mais recente no diretório de saída
+def latest_dataset(output_dir="."):
+    files = glob.glob(os.path.join(output_dir, DATASET_PATTERN))
+    return max(files, key=os.path.getmtime) if files else None
+
+# Estado da extração incremental (watermark e CSV de destino)
+def load_state(path):
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logging.warning(f"Estado incremental inválido em {path}: {e}")
+        return {}
+
+def save_state(path, state):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+# Extração completa
+def run_extract(config, write_csv=True):
+    try:
+        logging.info("Iniciando extração de dados Magis5")
+
+        # Testar conexão com API
+        if not test_api_connection(config):
+            logging.critical("Falha na conexão com API. Verificar Token e disponibilidade.")
+            return False
+
+        # Buscar pedidos simples
+        simple_orders, listing_complete = fetch_simple_orders(config)
+        if not simple_orders:
+            logging.error("Nenhum pedido simples encontrado.")
+            return False
+
+        # Processar pedidos simples
+        df_simple = process_simple_orders(simple_orders)
+        if df_simple.empty:
+            logging.error("Processamento de pedidos simples resultou vazio.")
+            return False
+
+        # Salvar backup dos dados simples
+        save_to_excel(df_simple, pd.DataFrame(), pd.DataFrame(), config.output_path("magis5_simples_backup.xlsx"))
+        logging.info(f"Backup dos dados simples salvos. Total: {len(df_simple)} registros")
+
+        # Buscar e processar pedidos completos
+        complete_orders_list, failed_ids = fetch_all_complete_orders(config, df_simple)
+        if not complete_orders_list:
+            logging.warning("Nenhum pedido completo encontrado. Salvando apenas dados simples.")
+            save_to_excel(df_simple, pd.DataFrame(), pd.DataFrame(), config.output_path(config.excel_file))
+            return True
+
+        # Correlacionar dados
+        df_complete, df_combined = correlate_orders(df_simple, complete_orders_list)
+
+        if write_csv and not df_complete.empty:
+            # Pedidos sem dados completos ficam fora do CSV dos dashboards
+            dataset = save_dataset_csv(_without_failed(df_complete, failed_ids), config.output_dir)
+            # O watermark só é gravado se nada ficou para trás; senão o próximo
+            # `magis5 incremental` refaz o período
+            if dataset and listing_complete and not failed_ids:
+                save_state(config.output_path(config.state_file),
+                           {"timestamp_to": config.timestamp_to, "dataset": dataset})
+            elif dataset:
+                logging.warning("Extração incompleta: watermark incremental não atualizado")
+
+        # Salvar resultado final
+        if save_to_excel(df_simple, df_complete, df_combined, config.output_path(config.excel_file)):
+            logging.info("Processo concluído com sucesso!")
+            return True
+        else:
+            logging.error("Falha ao salvar dados.")
+            return False
+
+    except Exception as e:
+        logging.critical(f"Erro inesperado: {e}")
+        logging.critical(traceback.format_exc())
+        return False
+
+# Extração incremental: busca apenas pedidos desde o último watermark (ou desde
+# `since`, quando informado) e acrescenta ao CSV dos dashboards. O watermark só
+# avança quando a busca termina sem falhas.
+def run_incremental(config, dataset=None, since=None):
+    try:
+        state_path = config.output_path(config.state_file)
+        state = load_state(state_path)
+        timestamp_from = since if since is not None else state.get("timestamp_to", config.timestamp_from)
+        dataset = dataset or state.get("dataset") or latest_dataset(config.output_dir)
+        config = config.with_overrides(timestamp_from=timestamp_from)
+
+        logging.info(f"Extração incremental desde {datetime.fromtimestamp(timestamp_from):%Y-%m-%d %H:%M:%S} "
+                     f"(dateSearchType={config.date_search_type})")
+        if config.date_search_type == "created":
+            logging.warning("Busca incremental por data de criação: pedidos antigos que mudaram de status "
+                            "não serão atualizados")
+
+        if not test_api_connection(config):
+            logging.critical("Falha na conexão com API. Verificar Token e disponibilidade.")
+            return False
+
+        simple_orders, listing_complete = fetch_simple_orders(config)
+        if not listing_complete:
+            logging.error("Busca de pedidos simples incompleta; nada foi gravado e o watermark foi mantido")
+            return False
+
+        failed_ids = []
+        if simple_orders:
+            df_simple = process_simple_orders(simple_orders)
+            complete_orders_list, failed_ids = fetch_all_complete_orders(config, df_simple)
+            df_complete, _ = correlate_orders(df_simple, complete_orders_list)
+            df_complete = _without_failed(df_complete, failed_ids)
+        else:
+            df_complete = pd.DataFrame()
+
+        if df_complete.empty:
+            logging.info("Nenhum pedido novo desde o último watermark")
+        elif dataset and os.path.exists(dataset):
+            if not append_dataset_csv(df_complete, dataset):
+                return False
+        else:
+            dataset = save_dataset_csv(df_complete, config.output_dir)
+            if not dataset:
+                return False
+
+        if failed_ids:
+            # Os pedidos obtidos já foram gravados; os que falharam voltam na próxima
+            # execução (ids repetidos substituem os anteriores nos dashboards)
+            logging.error(f"{len(failed_ids)} pedidos falharam; watermark mantido para nova tentativa")
+            return False
+
+        save_state(state_path, {"timestamp_to": config.timestamp_to, "dataset": dataset})
+        logging.info("Extração incremental concluída")
+        return True
+
+    except Exception as e:
+        logging.critical(f"Erro inesperado: {e}")
+        logging.critical(traceback.format_exc())
+        return False
+
+# Exporta um CSV dos dashboards para Excel, lendo em blocos para não carregar o CSV inteiro
+def run_export(source, filename, chunk_size=EXPORT_CHUNK_SIZE):
+    try:
+        with StreamingExcelWriter(filename) as writer:
+            sheet = None
+            for chunk in pd.read_csv(source, chunksize=chunk_size, decimal=",", dtype={"id": str},
+                                     **DATASET_CSV_OPTIONS):
+                sheet = sheet or writer.sheet("Completo", chunk.columns)
+                sheet.write_frame(chunk)
+    except Exception as e:
+        logging.error(f"Erro ao exportar {source}: {e}")
+        return False
+    rows = sheet.rows if sheet else 0
+    logging.info(f"{rows} registros de {source} salvos em {filename}"
+                 + (f" ({len(sheet.sheets)} planilhas)" if sheet and len(sheet.sheets) > 1 else ""))
+    return True
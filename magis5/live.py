@@ -0,0 +1,227 @@
+import glob
+import io
+import json
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from .config import DATASET_CSV_OPTIONS, DATASET_PATTERN, DEFAULT_STATE_FILE
+from .dashboard_data import (ROLLUPS, build_rollups, filter_orders, filter_rollups, load_orders, options,
+                             panel_summary, sales_summary, update_rollups)
+
+# Pedidos em memória que acompanham o(s) CSV(s) de origem sem recarregar tudo:
+# arquivos novos são lidos inteiros, arquivos que cresceram (o `magis5 incremental`
+# acrescenta linhas ao CSV) são lidos só a partir do último byte processado. Pedidos
+# com o mesmo id substituem os anteriores e os rollups diários são atualizados pela
+# diferença, sem refazer os agrupamentos sobre todas as linhas.
+
+@dataclass
+class _FileState:
+    inode: int
+    mtime_ns: int
+    size: int
+    offset: int
+    columns: list
+
+# Leitor que expõe apenas `limit` bytes do arquivo a partir da posição atual
+class _BoundedReader(io.RawIOBase):
+    def __init__(self, f, limit):
+        self._f = f
+        self._left = limit
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        size = min(len(buffer), self._left)
+        if size <= 0:
+            return 0
+        data = self._f.read(size)
+        buffer[:len(data)] = data
+        self._left -= len(data)
+        return len(data)
+
+# Posição logo após a última quebra de linha antes de `size` (ignora linha sendo escrita)
+def _complete_lines_end(f, start, size, block=1 << 16):
+    end = size
+    while end > start:
+        begin = max(start, end - block)
+        f.seek(begin)
+        newline = f.read(end - begin).rfind(b"\n")
+        if newline >= 0:
+            return begin + newline + 1
+        end = begin
+    return start
+
+# CSV atual de um diretório de saída: o registrado no estado incremental (última
+# extração completa + o que o `magis5 incremental` acrescentou) ou, sem ele, o
+# relatorio_magis5_*_registros_*.csv mais recente. Extrações anteriores são cópias
+# completas do histórico e não são lidas.
+def current_dataset(directory, state_file=None):
+    state_path = os.path.join(directory, state_file or os.environ.get("MAGIS5_STATE_FILE") or DEFAULT_STATE_FILE)
+    try:
+        with open(state_path, encoding="utf-8") as f:
+            dataset = json.load(f).get("dataset")
+    except (OSError, ValueError, AttributeError):
+        dataset = None
+    if dataset:
+        # O caminho gravado é relativo ao diretório em que o extrator rodou
+        for path in (dataset, os.path.join(directory, os.path.basename(dataset))):
+            if os.path.isfile(path):
+                return path
+    files = glob.glob(os.path.join(directory, DATASET_PATTERN))
+    return max(files, key=os.path.getmtime) if files else None
+
+class LiveOrders:
+    def __init__(self, source, columns=None, key="id"):
+        self.source = source
+        self.columns = list(columns) if columns is not None else None
+        self.key = key
+        self.version = 0
+        self.updated_at = None
+        self.frame = None
+        self.rollups = {}
+        self._files = {}
+        self._rebuild = False
+        self._lock = threading.Lock()
+
+    # Relê todos os arquivos; o frame atual continua visível até o novo ficar pronto
+    def _reset(self):
+        self._files = {}
+        self._rebuild = True
+
+    # Arquivos de origem, do mais antigo para o mais recente (os mais novos prevalecem).
+    # Um diretório contribui só com o CSV atual (veja current_dataset).
+    def paths(self):
+        if os.path.isdir(self.source):
+            dataset = current_dataset(self.source)
+            paths = [dataset] if dataset else []
+        elif glob.has_magic(self.source):
+            paths = glob.glob(self.source)
+        else:
+            paths = [self.source] if os.path.exists(self.source) else []
+        return sorted(paths, key=os.path.getmtime)
+
+    # Colunas do arquivo que serão carregadas (as pedidas pelo dashboard e a chave)
+    def _usecols(self, columns):
+        if self.columns is None:
+            return None
+        wanted = set(self.columns) | {self.key}
+        return [col for col in columns if col in wanted]
+
+    # Lê as linhas completas entre `start` e `size` (com cabeçalho quando start == 0)
+    def _read(self, path, start, size, columns):
+        with open(path, "rb") as f:
+            end = _complete_lines_end(f, start, size)
+            if end <= start:
+                return None, start, columns
+            if start == 0:
+                columns = list(pd.read_csv(path, nrows=0, **DATASET_CSV_OPTIONS).columns)
+            f.seek(start)
+            reader = io.BufferedReader(_BoundedReader(f, end - start))
+            header = {} if start == 0 else {"header": None, "names": columns}
+            chunk = load_orders(reader, self._usecols(columns), dtype={self.key: str}, **header)
+        return chunk, end, columns
+
+    # Confere mtime/tamanho dos arquivos e incorpora o que mudou; retorna o número de
+    # pedidos novos ou alterados
+    def refresh(self):
+        with self._lock:
+            paths = self.paths()
+            stats = {path: os.stat(path) for path in paths}
+
+            # Arquivo removido ou substituído: recomeça do zero
+            if any(path not in stats or stats[path].st_ino != state.inode or stats[path].st_size < state.size
+                   for path, state in self._files.items()):
+                self._reset()
+
+            changed = 0
+            for path in paths:
+                stat = stats[path]
+                state = self._files.get(path)
+                if state and state.mtime_ns == stat.st_mtime_ns and state.size == stat.st_size:
+                    continue
+                start, columns = (state.offset, state.columns) if state else (0, None)
+                chunk, offset, columns = self._read(path, start, stat.st_size, columns)
+                self._files[path] = _FileState(stat.st_ino, stat.st_mtime_ns, stat.st_size, offset, columns)
+                if chunk is not None and len(chunk):
+                    changed += self._upsert(chunk)
+
+            # Recomeço sem nenhuma linha (arquivo removido ou só com cabeçalho): os pedidos
+            # antigos deixam de existir
+            cleared = self._rebuild and self.frame is not None
+            if self._rebuild:
+                self.frame, self.rollups = None, {}
+                self._rebuild = False
+
+            if changed or cleared or self.updated_at is None:
+                self.version += 1
+                self.updated_at = datetime.now()
+            return changed
+
+    def _upsert(self, chunk):
+        has_key = self.key in chunk.columns
+        if has_key:
+            chunk = chunk.drop_duplicates(self.key, keep="last")
+
+        if self._rebuild or self.frame is None or self.frame.empty:
+            frame = chunk.reset_index(drop=True)
+            self.frame, self.rollups = frame, build_rollups(frame)
+            self._rebuild = False
+            return len(chunk)
+
+        old = self.frame
+        replaced = old[self.key].isin(chunk[self.key]).to_numpy() if has_key else np.zeros(len(old), dtype=bool)
+        removed = build_rollups(old[replaced]) if replaced.any() else None
+        kept, chunk = _align_categories(old[~replaced] if replaced.any() else old, chunk)
+
+        # Os novos frame/rollups são montados antes de trocar as referências, para que
+        # sessões lendo ao mesmo tempo vejam sempre um estado consistente
+        frame = pd.concat([kept, chunk], ignore_index=True)
+        rollups = update_rollups(self.rollups, build_rollups(chunk), removed)
+        self.frame, self.rollups = frame, rollups
+        return len(chunk)
+
+    # Consultas dos dashboards (as mesmas expostas pelo serviço em magis5.service)
+    def info(self):
+        return {
+            "pedidos": 0 if self.frame is None else len(self.frame),
+            "versao": self.version,
+            "atualizado": self.updated_at,
+        }
+
+    def date_range(self):
+        dates = self.frame["dateCreated"] if self.frame is not None else pd.Series(dtype="datetime64[ns]")
+        return dates.min(), dates.max()
+
+    def sales_summary(self, start=None, end=None):
+        return sales_summary(filter_rollups(self.rollups, start, end))
+
+    # Com filtros além das datas os agregados saem das linhas; sem eles, dos rollups
+    def panel_summary(self, start=None, end=None, produtos=None, canais=None, status=None, skus=None):
+        if produtos or canais or status or skus:
+            return panel_summary(self.orders(start, end, produtos, canais, status, skus))
+        return panel_summary(filter_rollups(self.rollups, start, end))
+
+    # Opções dos multiselects no período
+    def options(self, start=None, end=None):
+        rollups = filter_rollups(self.rollups, start, end)
+        return {name: options(frame, ROLLUPS[name]) for name, frame in rollups.items()}
+
+    def orders(self, start=None, end=None, produtos=None, canais=None, status=None, skus=None):
+        return filter_orders(self.frame, start, end, produtos=produtos, canais=canais, status=status, skus=skus)
+
+# Une as categorias para que o concat mantenha as colunas category
+def _align_categories(old, new):
+    old, new = old.copy(deep=False), new.copy(deep=False)
+    for col in old.columns.intersection(new.columns):
+        if isinstance(old[col].dtype, pd.CategoricalDtype) and isinstance(new[col].dtype, pd.CategoricalDtype):
+            missing = new[col].cat.categories.difference(old[col].cat.categories)
+            if len(missing):
+                old[col] = old[col].cat.add_categories(missing)
+            new[col] = new[col].cat.set_categories(old[col].cat.categories)
+    return old, new
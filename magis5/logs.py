@@ -0,0 +1,100 @@
+import atexit
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+LOG_MAX_BYTES = 10 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+LOG_SAMPLE_INTERVAL = 5.0  # Segundos entre mensagens repetitivas da mesma chave
+
+_listener = None
+_sampling_filter = None
+
+# Filtro que limita mensagens de alto volume (marcadas com extra={"sample_key": ...})
+# a uma por intervalo por chave. Em DEBUG todas as mensagens passam.
+class SamplingFilter(logging.Filter):
+    def __init__(self, interval=LOG_SAMPLE_INTERVAL):
+        super().__init__()
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._last_emit = {}
+        self._suppressed = {}
+        self._levels = {}
+
+    def filter(self, record):
+        key = getattr(record, "sample_key", None)
+        if key is None or logging.getLogger().isEnabledFor(logging.DEBUG):
+            return True
+
+        now = time.monotonic()
+        with self._lock:
+            last = self._last_emit.get(key)
+            if last is not None and now - last < self.interval:
+                self._suppressed[key] = self._suppressed.get(key, 0) + 1
+                self._levels[key] = max(self._levels.get(key, 0), record.levelno)
+                return False
+            self._last_emit[key] = now
+            suppressed = self._suppressed.pop(key, 0)
+            self._levels.pop(key, None)
+
+        if suppressed:
+            record.msg = f"{record.getMessage()} (+{suppressed} mensagens semelhantes suprimidas)"
+            record.args = None
+        return True
+
+    # Contagens ainda não reportadas: {chave: (quantidade, maior nível suprimido)}
+    def pop_pending(self):
+        with self._lock:
+            pending = {key: (count, self._levels.get(key, logging.INFO)) for key, count in self._suppressed.items()}
+            self._suppressed.clear()
+            self._levels.clear()
+        return pending
+
+# Esvazia a fila e encerra a thread de gravação (seguro para chamar mais de uma vez)
+def stop_logging():
+    global _listener, _sampling_filter
+    if _sampling_filter is not None:
+        # Supressões do fim da execução que nenhuma mensagem posterior chegou a reportar
+        for key, (count, level) in _sampling_filter.pop_pending().items():
+            logging.log(level, f"{count} mensagens semelhantes suprimidas ({key})")
+        _sampling_filter = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+_sampling_filter = None
+
+atexit.register(stop_logging)
+
+# Configuração de logs: as threads apenas enfileiram os registros e uma única
+# thread (QueueListener) formata e grava no arquivo rotativo e no console
+def setup_logging(level="INFO", log_file="magis5_log.txt"):
+    global _listener, _sampling_filter
+    stop_logging()
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = []
+    if log_file:
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8"
+        )
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+    handlers.append(stream_handler)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    _sampling_filter = SamplingFilter()
+    queue_handler.addFilter(_sampling_filter)
+
+    root = logging.getLogger()
+    root.handlers[:] = [queue_handler]
+    root.setLevel(level.upper() if isinstance(level, str) else level)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
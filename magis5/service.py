@@ -0,0 +1,156 @@
+import json
+import logging
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from .dashboard_data import SERVICE_COLUMNS
+from .live import LiveOrders
+
+# Serviço local de agregados: um único LiveOrders em memória atende todas as sessões
+# dos dashboards por HTTP, com cache dos resultados por rota + parâmetros (invalidado
+# quando a versão dos dados muda). O cliente correspondente está em magis5.client.
+
+FILTER_PARAMS = {"produto": "produtos", "canal": "canais", "status": "status", "sku": "skus"}
+
+# Cache LRU de respostas já serializadas, descartado a cada nova versão dos dados
+class ResultCache:
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._version = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, version, compute):
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        value = compute()
+        with self._lock:
+            if version == self._version:
+                self._entries[key] = value
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return value
+
+# Converte DataFrames/escalares numpy para tipos JSON (DataFrame -> {"columns", "data"})
+def to_jsonable(value):
+    if isinstance(value, pd.DataFrame):
+        return json.loads(value.to_json(orient="split", index=False, date_format="iso"))
+    if isinstance(value, dict):
+        return {key: to_jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(item) for item in value]
+    if isinstance(value, (pd.Timestamp, np.datetime64)) or hasattr(value, "isoformat"):
+        return None if pd.isna(value) else pd.Timestamp(value).isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+def _date_params(params):
+    return {"start": params.get("inicio", [None])[0] or None, "end": params.get("fim", [None])[0] or None}
+
+def _filter_params(params):
+    return {name: params[param] for param, name in FILTER_PARAMS.items() if params.get(param)}
+
+class AggregationService:
+    def __init__(self, source, columns=SERVICE_COLUMNS, cache_size=256, refresh_interval=30):
+        self.live = LiveOrders(source, columns)
+        self.cache = ResultCache(cache_size)
+        self.refresh_interval = refresh_interval
+        self._stop = threading.Event()
+        self.routes = {
+            "/saude": lambda params: self.live.info(),
+            "/intervalo": lambda params: dict(zip(("inicio", "fim"), self.live.date_range())),
+            "/opcoes": lambda params: self.live.options(**_date_params(params)),
+            "/resumo/vendas": lambda params: self.live.sales_summary(**_date_params(params)),
+            "/resumo/painel": lambda params: self.live.panel_summary(**_date_params(params), **_filter_params(params)),
+        }
+
+    def refresh(self):
+        try:
+            changed = self.live.refresh()
+            if changed:
+                logging.info(f"{changed} pedidos novos ou alterados (versão {self.live.version})")
+        except Exception as e:
+            logging.error(f"Erro ao atualizar dados: {e}")
+
+    def _refresh_loop(self):
+        while not self._stop.wait(self.refresh_interval):
+            self.refresh()
+
+    def start_refresh(self):
+        self.refresh()
+        if self.refresh_interval:
+            threading.Thread(target=self._refresh_loop, name="magis5-refresh", daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+
+    # Resposta (status, content-type, corpo) para uma rota GET
+    def handle(self, path, params):
+        if path == "/pedidos.csv":
+            # Linhas filtradas (dados brutos / exportação): não entram no cache
+            rows = self.live.orders(**_date_params(params), **_filter_params(params))
+            return 200, "text/csv; charset=utf-8", rows.to_csv(index=False, sep=";").encode("utf-8")
+
+        route = self.routes.get(path)
+        if route is None:
+            return 404, "application/json", b'{"erro": "rota desconhecida"}'
+        key = (path, tuple(sorted((name, tuple(values)) for name, values in params.items())))
+        body = self.cache.get_or_compute(
+            key, self.live.version, lambda: json.dumps(to_jsonable(route(params))).encode("utf-8")
+        )
+        return 200, "application/json", body
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "magis5"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        try:
+            status, content_type, body = self.server.service.handle(url.path, parse_qs(url.query))
+        except ValueError as e:
+            status, content_type = 400, "application/json"
+            body = json.dumps({"erro": str(e)}).encode("utf-8")
+        except Exception as e:
+            logging.error(f"Erro ao atender {self.path}: {e}")
+            status, content_type = 500, "application/json"
+            body = json.dumps({"erro": str(e)}).encode("utf-8")
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logging.debug(f"{self.address_string()} - {format % args}")
+
+def serve(source, host="127.0.0.1", port=8765, cache_size=256, refresh_interval=30):
+    service = AggregationService(source, cache_size=cache_size, refresh_interval=refresh_interval)
+    service.start_refresh()
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    server.service = service
+    logging.info(f"Serviço de agregados em http://{host}:{port} ({service.live.info()['pedidos']} pedidos)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+        server.server_close()
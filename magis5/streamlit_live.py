@@ -0,0 +1,80 @@
+import glob
+import os
+
+import streamlit as st
+
+from .config import DATASET_PATTERN
+from .live import LiveOrders
+
+# Integração dos dashboards Streamlit com a fonte de pedidos: o serviço compartilhado
+# (MAGIS5_SERVICE_URL, veja `magis5 serve`) ou, sem ele, um LiveOrders local
+# compartilhado entre as sessões e conferido a cada execução.
+
+# MAGIS5_DATASET pode apontar para um CSV, um padrão glob ou um diretório. Sem ela, usa
+# o diretório de saída do extrator (MAGIS5_OUTPUT_DIR, padrão "."), do qual o LiveOrders
+# lê só o CSV atual: o registrado no magis5_estado.json ou o mais recente; `fallback`
+# só é usado quando o diretório não tem nenhum relatorio_magis5_*_registros_*.csv.
+def dataset_source(fallback=None):
+    source = os.environ.get("MAGIS5_DATASET")
+    if source:
+        return source
+    output_dir = os.environ.get("MAGIS5_OUTPUT_DIR") or "."
+    if fallback and not glob.glob(os.path.join(output_dir, DATASET_PATTERN)):
+        return fallback
+    return output_dir
+
+@st.cache_resource(show_spinner="Carregando pedidos...")
+def live_orders(source, columns=None):
+    return LiveOrders(source, columns)
+
+@st.cache_resource
+def service_client(url):
+    from .client import ServiceClient
+    return ServiceClient(url)
+
+# Fonte de pedidos com a interface de consultas do LiveOrders
+def order_source(fallback=None, columns=None):
+    url = os.environ.get("MAGIS5_SERVICE_URL")
+    novos = 0
+    if url:
+        fonte = service_client(url)
+    else:
+        fonte = live_orders(dataset_source(fallback), tuple(columns) if columns else None)
+        novos = fonte.refresh()
+
+    try:
+        info = fonte.info()
+    except OSError as e:
+        st.error(f"Serviço de agregados indisponível em {url}: {e}")
+        st.stop()
+    if not info["pedidos"]:
+        st.error("Nenhum pedido encontrado na fonte de dados")
+        st.stop()
+
+    st.sidebar.caption(f"🔄 {info['pedidos']:,} pedidos · versão {info['versao']} · "
+                       f"atualizado às {info['atualizado']:%H:%M:%S}")
+    if novos:
+        st.sidebar.caption(f"+{novos:,} pedidos novos ou alterados")
+    return fonte
+
+def auto_refresh_interval():
+    default = int(os.environ.get("MAGIS5_AUTO_REFRESH", 0))
+    return st.sidebar.number_input("🔄 Atualização automática (segundos, 0 = desligada)",
+                                   min_value=0, value=default, step=30)
+
+# Chamado no fim do script: um fragmento reexecutado a cada `interval` segundos confere
+# a versão dos dados e só executa a página de novo quando ela muda. O script não fica
+# parado esperando, então mudanças de filtro são aplicadas na hora.
+def schedule_refresh(fonte, interval):
+    if not interval:
+        return
+    versao = fonte.info()["versao"]
+
+    @st.fragment(run_every=interval)
+    def verificar_dados():
+        if isinstance(fonte, LiveOrders):
+            fonte.refresh()
+        if fonte.info()["versao"] != versao:
+            st.rerun()
+
+    verificar_dados()
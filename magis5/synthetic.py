@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+
+from .config import DATASET_CSV_OPTIONS
+
+# Gerador de pedidos sintéticos no formato do CSV dos dashboards, com distribuições
+# assimétricas (popularidade de produtos tipo Zipf, canais e pagamentos concentrados,
+# crescimento ao longo do tempo e picos sazonais).
+
+CHANNELS = {
+    "MERCADOLIVRE-FULL": 0.30, "MERCADOLIVRE-CLASSICO": 0.17, "SHOPEE-LOJA1": 0.18, "SHOPEE-LOJA2": 0.05,
+    "AMAZON-FBA": 0.10, "MAGALU-LOJA": 0.08, "AMERICANAS-B2W": 0.05, "SITE-PROPRIO": 0.04, "SHEIN-LOJA": 0.03,
+}
+STATUSES = {
+    "delivered": 0.55, "shipped": 0.15, "paid": 0.09, "invoiced": 0.08,
+    "cancelled": 0.09, "returned": 0.03, "pending": 0.01,
+}
+PAYMENT_TYPES = {
+    "credit_card": 0.52, "pix": 0.23, "account_money": 0.12, "ticket": 0.07, "debit_card": 0.06,
+}
+PRODUCT_CATEGORIES = [
+    "Capinha", "Película", "Carregador", "Cabo USB", "Fone Bluetooth", "Suporte Veicular",
+    "Smartwatch", "Caixa de Som", "Mouse", "Teclado", "Power Bank", "Adaptador",
+]
+# Peso relativo de cada dia da semana (segunda = 0)
+WEEKDAY_WEIGHTS = np.array([1.10, 1.05, 1.00, 1.00, 0.95, 0.80, 0.75])
+CATALOG_SEED = 12345
+
+SYNTHETIC_COLUMNS = [
+    "id", "status", "dateCreated", "dateLastUpdated", "totalValue", "channel", "payment_type",
+    "item_title", "item_sku", "item_quantity", "item_price", "item_cost",
+]
+
+def _choice(rng, weights, size):
+    labels = list(weights)
+    p = np.array(list(weights.values()), dtype=float)
+    codes = rng.choice(len(labels), size=size, p=p / p.sum())
+    return pd.Categorical.from_codes(codes, labels)
+
+def default_catalog_size(rows):
+    return int(min(50_000, max(200, rows // 100)))
+
+# Catálogo de produtos fixo para um dado tamanho (igual em todos os blocos gerados)
+def make_catalog(n_products):
+    rng = np.random.default_rng(CATALOG_SEED)
+    categories = rng.integers(0, len(PRODUCT_CATEGORIES), n_products)
+    titles = [f"{PRODUCT_CATEGORIES[c]} Modelo {i:05d}" for i, c in enumerate(categories)]
+    skus = [f"SKU-{i:06d}" for i in range(n_products)]
+    price = np.round(rng.lognormal(mean=np.log(60), sigma=0.8, size=n_products), 2)
+    cost = np.round(price * rng.uniform(0.35, 0.75, n_products), 2)
+    popularity = 1.0 / np.arange(1, n_products + 1) ** 1.1
+    rng.shuffle(popularity)
+    return {
+        "titles": titles,
+        "skus": skus,
+        "price": price,
+        "cost": cost,
+        "p": popularity / popularity.sum(),
+    }
+
+# Probabilidade de cada dia do período: crescimento linear, semana e picos de fim de ano
+def _day_weights(days):
+    trend = np.linspace(1.0, 2.5, len(days))
+    weekly = WEEKDAY_WEIGHTS[days.dayofweek]
+    seasonal = np.ones(len(days))
+    seasonal[(days.month == 11) & (days.day >= 20)] = 2.5  # Black Friday
+    seasonal[days.month == 12] = 1.6
+    weights = trend * weekly * seasonal
+    return weights / weights.sum()
+
+def generate_orders(rows, seed=0, start=None, end=None, n_products=None, first_id=1, catalog=None):
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp(end) if end else pd.Timestamp.today().normalize()
+    start = pd.Timestamp(start) if start else end - pd.DateOffset(years=2)
+    catalog = catalog or make_catalog(n_products or default_catalog_size(rows))
+
+    # Produtos
+    product = rng.choice(len(catalog["p"]), size=rows, p=catalog["p"])
+    quantity = np.minimum(rng.geometric(0.65, rows), 20)
+    price = np.round(catalog["price"][product] * rng.normal(1.0, 0.05, rows).clip(0.7, 1.3), 2)
+    cost = catalog["cost"][product]
+    shipping = np.where(rng.random(rows) < 0.6, 0.0, np.round(rng.exponential(15, rows), 2))
+
+    # Datas
+    days = pd.date_range(start, end, freq="D")
+    day = rng.choice(len(days), size=rows, p=_day_weights(days))
+    seconds = rng.normal(15 * 3600, 4 * 3600, rows).clip(0, 86399).astype("int64")
+    created = days.values[day] + seconds.astype("timedelta64[s]")
+    updated = created + rng.exponential(3 * 86400, rows).astype("int64").astype("timedelta64[s]")
+
+    df = pd.DataFrame({
+        "id": np.arange(first_id, first_id + rows, dtype="int64"),
+        "status": _choice(rng, STATUSES, rows),
+        "dateCreated": created,
+        "dateLastUpdated": updated,
+        "totalValue": np.round(price * quantity + shipping, 2),
+        "channel": _choice(rng, CHANNELS, rows),
+        "payment_type": _choice(rng, PAYMENT_TYPES, rows),
+        "item_title": pd.Categorical.from_codes(product, catalog["titles"]),
+        "item_sku": pd.Categorical.from_codes(product, catalog["skus"]),
+        "item_quantity": quantity,
+        "item_price": price,
+        "item_cost": cost,
+    })
+    return df[SYNTHETIC_COLUMNS]
+
+# Nome padrão dos CSVs sintéticos: fora do DATASET_PATTERN, para que os dashboards,
+# o export e o incremental nunca confundam dados falsos com uma extração real
+def default_filename(rows, seed=0):
+    return f"synthetic_{rows}_{seed}.csv"
+
+# Grava o CSV em blocos, para gerar 10M+ linhas sem manter tudo em memória
+def write_orders_csv(path, rows, seed=0, start=None, end=None, chunk_size=1_000_000):
+    end = pd.Timestamp(end) if end else pd.Timestamp.today().normalize()
+    catalog = make_catalog(default_catalog_size(rows))
+    written = 0
+    while written < rows:
+        size = min(chunk_size, rows - written)
+        chunk = generate_orders(size, seed=seed + written, start=start, end=end,
+                                first_id=written + 1, catalog=catalog)
+        chunk.to_csv(path, mode="w" if written == 0 else "a", header=written == 0, index=False,
+                     decimal=",", date_format="%Y-%m-%dT%H:%M:%S", **DATASET_CSV_OPTIONS)
+        written += size
+    return path
@@ -0,0 +1,127 @@
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pandas as pd
+
+from magis5.excel import SHEET_NAME_MAX, StreamingExcelWriter
+from magis5.extractor import run_export, save_to_excel
+
+# Lê o .xlsx gerado direto do XML: nomes das planilhas e células por planilha.
+
+NS = {"x": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+def _sheet_names(path):
+    with zipfile.ZipFile(path) as xlsx:
+        workbook = ET.fromstring(xlsx.read("xl/workbook.xml"))
+    return [sheet.get("name") for sheet in workbook.iterfind("x:sheets/x:sheet", NS)]
+
+# {planilha: [{"A1": valor, ...} por linha]}; números como float, textos como str
+def _cells(path):
+    sheets = {}
+    with zipfile.ZipFile(path) as xlsx:
+        for index, name in enumerate(_sheet_names(path), start=1):
+            root = ET.fromstring(xlsx.read(f"xl/worksheets/sheet{index}.xml"))
+            rows = []
+            for row in root.iterfind("x:sheetData/x:row", NS):
+                cells = {}
+                for cell in row.iterfind("x:c", NS):
+                    column = re.match(r"[A-Z]+", cell.get("r")).group()
+                    if cell.get("t") == "inlineStr":
+                        cells[column] = cell.findtext("x:is/x:t", namespaces=NS)
+                    elif cell.get("t") == "e":
+                        cells[column] = cell.findtext("x:v", namespaces=NS)
+                    elif cell.get("t") == "b":
+                        cells[column] = cell.findtext("x:v", namespaces=NS) == "1"
+                    else:
+                        cells[column] = float(cell.findtext("x:v", namespaces=NS))
+                rows.append(cells)
+            sheets[name] = rows
+    return sheets
+
+def test_splits_at_row_limit_with_header_on_each_sheet(tmp_path):
+    path = str(tmp_path / "split.xlsx")
+    df = pd.DataFrame({"id": [f"p{i}" for i in range(5)], "valor": range(5)})
+    with StreamingExcelWriter(path, max_rows=3) as writer:
+        sheet = writer.write_dataframe("Completo", df)
+
+    assert sheet.rows == 5
+    assert sheet.sheets == ["Completo", "Completo_2", "Completo_3"]
+    cells = _cells(path)
+    assert list(cells) == sheet.sheets
+    for rows in cells.values():
+        assert rows[0] == {"A": "id", "B": "valor"}
+        assert len(rows) <= 3
+    data = [row for rows in cells.values() for row in rows[1:]]
+    assert data == [{"A": f"p{i}", "B": float(i)} for i in range(5)]
+
+def test_exact_limit_does_not_open_empty_sheet(tmp_path):
+    path = str(tmp_path / "exato.xlsx")
+    with StreamingExcelWriter(path, max_rows=3) as writer:
+        sheet = writer.write_dataframe("Completo", pd.DataFrame({"id": ["a", "b"]}))
+    assert sheet.sheets == ["Completo"]
+    assert _sheet_names(path) == ["Completo"]
+
+def test_split_sheet_names_fit_excel_limit(tmp_path):
+    path = str(tmp_path / "nomes.xlsx")
+    name = "Pedidos completos do marketplace"  # 32 caracteres
+    with StreamingExcelWriter(path, max_rows=2) as writer:
+        sheet = writer.write_dataframe(name, pd.DataFrame({"id": range(12)}))
+
+    assert len(sheet.sheets) == 12
+    assert all(len(sheet_name) <= SHEET_NAME_MAX for sheet_name in sheet.sheets)
+    assert sheet.sheets[0] == name[:SHEET_NAME_MAX]
+    assert sheet.sheets[1] == name[:SHEET_NAME_MAX - 2] + "_2"
+    assert sheet.sheets[11] == name[:SHEET_NAME_MAX - 3] + "_12"
+    assert _sheet_names(path) == sheet.sheets
+
+def test_missing_values_are_blank_cells(tmp_path):
+    path = str(tmp_path / "vazios.xlsx")
+    df = pd.DataFrame({
+        "inteiro": pd.array([1, None, 3], dtype="Int64"),
+        "texto": pd.array(["a", None, ""], dtype="string"),
+        "objeto": ["x", None, np.nan],
+        "decimal": [1.5, np.nan, np.inf],
+        "quando": pd.to_datetime(["2025-01-02 03:00", None, "2025-01-03 00:00"]).tz_localize("America/Sao_Paulo"),
+        "flag": [True, False, True],
+    })
+    with StreamingExcelWriter(path) as writer:
+        writer.write_dataframe("Dados", df)
+
+    header, first, second, third = _cells(path)["Dados"]
+    assert header == {"A": "inteiro", "B": "texto", "C": "objeto", "D": "decimal", "E": "quando", "F": "flag"}
+    # 2025-01-02 03:00 sem fuso = serial 45659.125 do Excel
+    assert first == {"A": 1.0, "B": "a", "C": "x", "D": 1.5, "E": 45659.125, "F": True}
+    assert second == {"F": False}
+    assert third["A"] == 3.0 and "B" not in third and "C" not in third
+    assert third["E"] == 45660.0
+    assert third["D"] == "#DIV/0!"  # inf vira erro do Excel (nan_inf_to_errors)
+    with zipfile.ZipFile(path) as xlsx:
+        xml = xlsx.read("xl/worksheets/sheet1.xml").decode()
+    assert "&lt;NA&gt;" not in xml and "nan" not in xml.lower().replace("inlinestr", "")
+
+def test_save_to_excel_writes_three_sheets(tmp_path):
+    path = str(tmp_path / "relatorio.xlsx")
+    simple = pd.DataFrame({"id": ["1", "2"], "status": ["paid", "shipped"]})
+    complete = pd.DataFrame({"id": ["1"], "totalValue": [10.0]})
+    combined = simple.merge(complete, on="id", how="left")
+    assert save_to_excel(simple, complete, combined, path)
+
+    cells = _cells(path)
+    assert list(cells) == ["Simples", "Completo", "Combinado"]
+    assert cells["Combinado"][2] == {"A": "2", "B": "shipped"}
+
+    assert save_to_excel(simple, pd.DataFrame(), pd.DataFrame(), path)
+    assert _sheet_names(path) == ["Simples"]
+
+def test_run_export_streams_csv_in_chunks(tmp_path):
+    source = tmp_path / "pedidos.csv"
+    pd.DataFrame({"id": ["007", "8", "9"], "totalValue": [1.25, None, 3.0]}).to_csv(
+        source, sep=";", encoding="latin1", decimal=",", index=False)
+    path = str(tmp_path / "export.xlsx")
+    assert run_export(str(source), path, chunk_size=2)
+
+    header, *rows = _cells(path)["Completo"]
+    assert header == {"A": "id", "B": "totalValue"}
+    assert rows == [{"A": "007", "B": 1.25}, {"A": "8"}, {"A": "9", "B": 3.0}]
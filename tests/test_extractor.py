@@ -0,0 +1,173 @@
+import glob
+import json
+import os
+
+import pandas as pd
+import pytest
+import requests
+
+from magis5 import api, cli, extractor
+from magis5.config import DATASET_CSV_OPTIONS, Config
+
+# Regras do watermark incremental com uma API falsa no lugar de requests.get: o
+# magis5_estado.json só avança quando a listagem e todos os pedidos completos vieram.
+
+BASE_URL = "https://api.teste/v1"
+TIMESTAMP_TO = 1767225600  # 2026-01-01
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error", response=self)
+
+class FakeApi:
+    def __init__(self, ids, page_limit=2, failing_pages=(), failing_orders=()):
+        self.ids = [str(i) for i in ids]
+        self.page_limit = page_limit
+        self.failing_pages = set(failing_pages)
+        self.failing_orders = {str(i) for i in failing_orders}
+        self.listings = []
+
+    def _order(self, order_id):
+        return {
+            "id": order_id,
+            "status": "paid",
+            "dateCreated": "2025-12-01T10:00:00",
+            "channel": "MERCADOLIVRE",
+            "totalValue": 100.0,
+            "links": [{"rel": "self", "type": "GET", "href": f"/orders/{order_id}"}],
+        }
+
+    def get(self, url, headers=None, params=None, timeout=None):
+        path = url[len(BASE_URL):]
+        if path == "/orders":
+            params = dict(params or {})
+            if params.get("limit") == "1":  # test_api_connection
+                return FakeResponse(200, {"orders": []})
+            self.listings.append(params)
+            page = int(params["page"])
+            if page in self.failing_pages:
+                return FakeResponse(500)
+            size = int(params["limit"])
+            chunk = self.ids[(page - 1) * size:page * size]
+            return FakeResponse(200, {"orders": [self._order(order_id) for order_id in chunk]})
+
+        order_id = path.rsplit("/", 1)[-1]
+        if order_id in self.failing_orders:
+            return FakeResponse(500)
+        return FakeResponse(200, self._order(order_id))
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    def install(*args, **kwargs):
+        fake = FakeApi(*args, **kwargs)
+        monkeypatch.setattr(api.requests, "get", fake.get)
+        return fake
+    monkeypatch.setattr(api.time, "sleep", lambda seconds: None)
+    return install
+
+@pytest.fixture
+def config(tmp_path):
+    return Config(api_base_url=BASE_URL, api_token="teste", output_dir=str(tmp_path), page_limit=2,
+                  max_retries=2, initial_sleep=0, max_workers=2, timestamp_to=TIMESTAMP_TO, log_file="")
+
+def _state(config):
+    path = config.output_path(config.state_file)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def _dataset_ids(config):
+    files = glob.glob(os.path.join(config.output_dir, "relatorio_magis5_*_registros_*.csv"))
+    if not files:
+        return None
+    assert len(files) == 1
+    return sorted(pd.read_csv(files[0], dtype={"id": str}, **DATASET_CSV_OPTIONS)["id"])
+
+def test_incremental_clean_run_advances_watermark(fake_api, config):
+    fake = fake_api(range(1, 6))
+    assert extractor.run_incremental(config)
+    assert _dataset_ids(config) == ["1", "2", "3", "4", "5"]
+    state = _state(config)
+    assert state["timestamp_to"] == TIMESTAMP_TO
+    assert state["dataset"].startswith(config.output_dir)
+    assert fake.listings[0]["dateSearchType"] == config.date_search_type
+
+def test_incremental_incomplete_listing_keeps_watermark(fake_api, config):
+    fake_api(range(1, 6), failing_pages=[2])
+    assert not extractor.run_incremental(config)
+    assert _state(config) is None
+    assert _dataset_ids(config) is None
+
+def test_incremental_max_pages_keeps_watermark(fake_api, config):
+    fake_api(range(1, 6))
+    assert not extractor.run_incremental(config.with_overrides(max_pages=1))
+    assert _state(config) is None
+    assert _dataset_ids(config) is None
+
+def test_incremental_failed_orders_are_not_appended(fake_api, config):
+    fake_api(range(1, 6), failing_orders=[3])
+    assert not extractor.run_incremental(config)
+    assert _state(config) is None
+    # Pedidos obtidos são gravados; o que falhou não entra como linha vazia
+    assert _dataset_ids(config) == ["1", "2", "4", "5"]
+
+def test_incremental_uses_watermark_unless_since_is_given(fake_api, config):
+    extractor.save_state(config.output_path(config.state_file), {"timestamp_to": 1700000000, "dataset": None})
+
+    fake = fake_api(range(1, 3))
+    assert extractor.run_incremental(config)
+    assert fake.listings[0]["timestampFrom"] == "1700000000"
+    assert _state(config)["timestamp_to"] == TIMESTAMP_TO
+
+    fake = fake_api(range(1, 3))
+    assert extractor.run_incremental(config, since=1600000000)
+    assert fake.listings[0]["timestampFrom"] == "1600000000"
+
+def test_extract_writes_state_only_when_complete(fake_api, config):
+    fake_api(range(1, 6), failing_orders=[2])
+    assert extractor.run_extract(config)
+    assert _state(config) is None
+    assert _dataset_ids(config) == ["1", "3", "4", "5"]
+
+    for path in glob.glob(os.path.join(config.output_dir, "relatorio_magis5_*.csv")):
+        os.remove(path)
+    fake_api(range(1, 6))
+    assert extractor.run_extract(config)
+    assert _state(config)["timestamp_to"] == TIMESTAMP_TO
+    assert _dataset_ids(config) == ["1", "2", "3", "4", "5"]
+
+def test_extract_incomplete_listing_keeps_watermark(fake_api, config):
+    fake_api(range(1, 6), failing_pages=[3])
+    assert extractor.run_extract(config)
+    assert _state(config) is None
+
+def test_config_precedence(monkeypatch):
+    monkeypatch.delenv("MAGIS5_MAX_WORKERS", raising=False)
+    monkeypatch.delenv("MAGIS5_DATE_SEARCH_TYPE", raising=False)
+    assert Config.from_env().max_workers == 10
+    assert Config.from_env({"date_search_type": "updated"}).date_search_type == "updated"
+
+    monkeypatch.setenv("MAGIS5_MAX_WORKERS", "4")
+    monkeypatch.setenv("MAGIS5_DATE_SEARCH_TYPE", "created")
+    assert Config.from_env().max_workers == 4
+    assert Config.from_env({"date_search_type": "updated"}).date_search_type == "created"
+    assert Config.from_env(max_workers=8, date_search_type=None).max_workers == 8
+
+    args = cli.build_parser().parse_args(["incremental", "--workers", "6"])
+    assert cli._config_from_args(args).max_workers == 6
+
+def test_missing_token_exits_with_status_2(monkeypatch, capsys):
+    monkeypatch.delenv("MAGIS5_API_TOKEN", raising=False)
+    for argv in (["extract"], ["incremental"], ["extract", "--check"]):
+        assert cli.main(argv) == 2
+        assert "MAGIS5_API_TOKEN" in capsys.readouterr().err
+    assert cli.main(["extract", "--dry-run"]) == 0
@@ -0,0 +1,190 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from magis5.config import DATASET_CSV_OPTIONS, DEFAULT_STATE_FILE
+from magis5.dashboard_data import PANEL_COLUMNS, panel_summary
+from magis5.live import LiveOrders
+from magis5.synthetic import generate_orders
+
+# O LiveOrders atualizado incrementalmente (append, linha parcial, ids substituídos)
+# tem que ficar igual a um LiveOrders novo lido do mesmo arquivo.
+
+START, END = "2025-01-01", "2025-03-31"
+
+def _csv_text(rows, first_id, seed, header=False):
+    orders = generate_orders(rows, seed=seed, start=START, end=END, first_id=first_id)
+    return orders.to_csv(index=False, header=header, decimal=",", date_format="%Y-%m-%dT%H:%M:%S",
+                         sep=DATASET_CSV_OPTIONS["sep"])
+
+def _write(path, text, mode="w"):
+    with open(path, mode, encoding=DATASET_CSV_OPTIONS["encoding"], newline="") as f:
+        f.write(text)
+
+def _normalize(frame):
+    frame = frame.reset_index(drop=True)
+    for col in frame.columns:
+        if isinstance(frame[col].dtype, pd.CategoricalDtype):
+            frame[col] = frame[col].astype(object)
+    return frame.sort_values(list(frame.columns)).reset_index(drop=True)
+
+def assert_same_frames(left, right):
+    pd.testing.assert_frame_equal(_normalize(left), _normalize(right), check_dtype=False, rtol=1e-9)
+
+def assert_same_result(left, right):
+    assert left.keys() == right.keys()
+    for name in left:
+        if isinstance(left[name], pd.DataFrame):
+            assert_same_frames(left[name], right[name])
+        else:
+            assert left[name] == pytest.approx(right[name], rel=1e-9), name
+
+def assert_matches_fresh(live, path, columns=None):
+    fresh = LiveOrders(path, columns)
+    fresh.refresh()
+    assert_same_frames(live.frame, fresh.frame)
+    assert live.rollups.keys() == fresh.rollups.keys()
+    for name in live.rollups:
+        assert_same_frames(live.rollups[name], fresh.rollups[name])
+    assert_same_result(live.panel_summary(), fresh.panel_summary())
+    if "pagamento" in live.rollups:
+        assert_same_result(live.sales_summary(), fresh.sales_summary())
+    # Os rollups também batem com os agregados calculados a partir das linhas
+    assert_same_result(live.panel_summary(), panel_summary(fresh.frame))
+    return fresh
+
+@pytest.fixture
+def dataset(tmp_path):
+    path = tmp_path / "relatorio_magis5_300_registros_2025-04-01_00-00-00.csv"
+    _write(path, _csv_text(300, first_id=1, seed=1, header=True))
+    return str(path)
+
+@pytest.mark.parametrize("columns", [None, PANEL_COLUMNS])
+def test_append_with_replaced_ids_matches_full_reload(dataset, columns):
+    live = LiveOrders(dataset, columns)
+    assert live.refresh() == 300
+
+    # 50 pedidos novos (301-350) e 50 que substituem pedidos existentes (251-300)
+    _write(dataset, _csv_text(100, first_id=251, seed=2), mode="a")
+    assert live.refresh() == 100
+    assert len(live.frame) == 350
+    assert live.frame["id"].is_unique
+    assert_matches_fresh(live, dataset, columns)
+
+def test_partial_last_line_is_read_only_when_complete(dataset):
+    live = LiveOrders(dataset)
+    live.refresh()
+    version = live.version
+
+    text = _csv_text(20, first_id=301, seed=3)
+    cut = text.rindex("\n", 0, len(text) - 1) + 10  # Metade da última linha
+    _write(dataset, text[:cut], mode="a")
+    assert live.refresh() == 19
+    assert "320" not in set(live.frame["id"])
+    assert live.version == version + 1
+    assert_matches_fresh(live, dataset)
+
+    # Sem mudança no arquivo: nada é lido e a versão não muda
+    assert live.refresh() == 0
+    assert live.version == version + 1
+
+    _write(dataset, text[cut:], mode="a")
+    assert live.refresh() == 1
+    assert "320" in set(live.frame["id"])
+    assert_matches_fresh(live, dataset)
+
+def test_replaced_ids_subtract_from_rollups(dataset):
+    live = LiveOrders(dataset)
+    live.refresh()
+    before = live.panel_summary()["kpis"]["vendas_total"]
+
+    # Reenvia os mesmos pedidos com valor zerado: o total tem que cair exatamente
+    replaced = pd.read_csv(dataset, dtype={"id": str}, decimal=",", **DATASET_CSV_OPTIONS).head(10)
+    removed_value = replaced["totalValue"].sum()
+    replaced["totalValue"] = 0.0
+    _write(dataset, replaced.to_csv(index=False, header=False, decimal=",", sep=DATASET_CSV_OPTIONS["sep"]),
+           mode="a")
+    assert live.refresh() == 10
+    assert live.panel_summary()["kpis"]["vendas_total"] == pytest.approx(before - removed_value)
+    assert_matches_fresh(live, dataset)
+
+def test_reset_when_file_shrinks(dataset):
+    live = LiveOrders(dataset)
+    live.refresh()
+
+    # Reescrito no lugar (mesmo inode) com menos pedidos e ids diferentes
+    _write(dataset, _csv_text(100, first_id=1001, seed=4, header=True))
+    live.refresh()
+    assert set(live.frame["id"]) == {str(i) for i in range(1001, 1101)}
+    assert_matches_fresh(live, dataset)
+
+@pytest.mark.parametrize("change", ["header_only", "removed"])
+def test_reset_without_rows_clears_orders(dataset, change):
+    live = LiveOrders(dataset)
+    live.refresh()
+    version = live.version
+
+    if change == "header_only":
+        _write(dataset, _csv_text(0, first_id=1, seed=1, header=True))
+    else:
+        os.remove(dataset)
+    assert live.refresh() == 0
+    assert live.version == version + 1
+    assert live.info()["pedidos"] == 0
+    assert live.frame is None and live.rollups == {}
+
+    # Pedidos novos voltam a ser lidos normalmente
+    _write(dataset, _csv_text(20, first_id=2001, seed=8, header=True))
+    assert live.refresh() == 20
+    assert_matches_fresh(live, dataset)
+
+def test_reset_when_file_replaced(dataset, tmp_path):
+    live = LiveOrders(dataset)
+    live.refresh()
+
+    # Substituído por outro arquivo (novo inode) maior que o anterior
+    replacement = tmp_path / "novo.tmp"
+    _write(replacement, _csv_text(400, first_id=5001, seed=5, header=True))
+    os.replace(replacement, dataset)
+    live.refresh()
+    assert set(live.frame["id"]) == {str(i) for i in range(5001, 5401)}
+    assert_matches_fresh(live, dataset)
+
+def _newer_file(tmp_path, name, dataset, rows, first_id, seed):
+    path = tmp_path / name
+    _write(path, _csv_text(rows, first_id=first_id, seed=seed, header=True))
+    stat = os.stat(dataset)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    return str(path)
+
+def test_directory_reads_only_newest_extraction(dataset, tmp_path):
+    live = LiveOrders(str(tmp_path))
+    assert live.refresh() == 300
+
+    # Nova extração completa: substitui a anterior em vez de somar as duas
+    newer = _newer_file(tmp_path, "relatorio_magis5_50_registros_2025-04-02_00-00-00.csv", dataset, 50, 281, 6)
+    live.refresh()
+    assert live.paths() == [newer]
+    assert set(live.frame["id"]) == {str(i) for i in range(281, 331)}
+    assert_matches_fresh(live, newer)
+
+def test_directory_follows_state_file(dataset, tmp_path):
+    newer = _newer_file(tmp_path, "relatorio_magis5_50_registros_2025-04-02_00-00-00.csv", dataset, 50, 281, 6)
+    # O estado grava o caminho relativo ao diretório em que o extrator rodou
+    _write(tmp_path / DEFAULT_STATE_FILE, json.dumps({"timestamp_to": 0, "dataset": os.path.join("saida", os.path.basename(dataset))}))
+
+    live = LiveOrders(str(tmp_path))
+    assert live.refresh() == 300
+    assert live.paths() == [dataset]
+
+    _write(dataset, _csv_text(10, first_id=301, seed=7), mode="a")
+    assert live.refresh() == 10
+    assert_matches_fresh(live, dataset)
+
+    # Estado aponta para a nova extração: recomeça só com ela
+    _write(tmp_path / DEFAULT_STATE_FILE, json.dumps({"timestamp_to": 0, "dataset": newer}))
+    live.refresh()
+    assert set(live.frame["id"]) == {str(i) for i in range(281, 331)}
+    assert_matches_fresh(live, newer)
@@ -0,0 +1,63 @@
+import logging
+
+import pytest
+
+from magis5 import logs
+
+def _record(msg, key="retry_pedido", level=logging.INFO):
+    record = logging.LogRecord("root", level, __file__, 1, msg, None, None)
+    record.sample_key = key
+    return record
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(logs.time, "monotonic", lambda: now[0])
+    return now
+
+@pytest.fixture
+def root_level():
+    root = logging.getLogger()
+    level = root.level
+    yield root.setLevel
+    root.setLevel(level)
+
+def test_one_record_per_key_per_interval(clock, root_level):
+    root_level(logging.INFO)
+    sampler = logs.SamplingFilter(interval=5)
+
+    assert sampler.filter(_record("tentativa 1"))
+    assert not sampler.filter(_record("tentativa 2"))
+    assert not sampler.filter(_record("tentativa 3"))
+    # Outras chaves e mensagens sem chave não são afetadas
+    assert sampler.filter(_record("progresso", key="progresso"))
+    assert sampler.filter(_record("sem chave", key=None))
+
+    clock[0] += 5
+    record = _record("tentativa 4")
+    assert sampler.filter(record)
+    assert record.getMessage() == "tentativa 4 (+2 mensagens semelhantes suprimidas)"
+    assert sampler.pop_pending() == {}
+
+def test_everything_passes_at_debug(clock, root_level):
+    root_level(logging.DEBUG)
+    sampler = logs.SamplingFilter(interval=5)
+    records = [_record(f"tentativa {i}") for i in range(5)]
+    assert all(sampler.filter(record) for record in records)
+    assert records[-1].getMessage() == "tentativa 4"
+
+def test_pending_counts_are_reported_on_stop(clock, root_level, caplog):
+    root_level(logging.INFO)
+    sampler = logs.SamplingFilter(interval=5)
+    sampler.filter(_record("tentativa 1"))
+    sampler.filter(_record("tentativa 2"))
+    sampler.filter(_record("falha", level=logging.WARNING))
+
+    logs._sampling_filter = sampler
+    with caplog.at_level(logging.INFO):
+        logs.stop_logging()
+
+    assert [(r.levelno, r.getMessage()) for r in caplog.records] == [
+        (logging.WARNING, "2 mensagens semelhantes suprimidas (retry_pedido)")
+    ]
+    assert logs._sampling_filter is None
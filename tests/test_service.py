@@ -0,0 +1,129 @@
+import threading
+from http.server import ThreadingHTTPServer
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from magis5.client import ServiceClient
+from magis5.config import DATASET_CSV_OPTIONS
+from magis5.service import AggregationService, _Handler, to_jsonable
+from magis5.synthetic import generate_orders
+
+# Modo cliente leve dos dashboards: as respostas do serviço, depois da ida e volta
+# em JSON/CSV, têm que ser iguais às consultas diretas ao LiveOrders.
+
+def _append_orders(path, rows, first_id, seed, header=False):
+    orders = generate_orders(rows, seed=seed, start="2025-01-01", end="2025-03-31", first_id=first_id)
+    orders.to_csv(path, mode="w" if header else "a", header=header, index=False, decimal=",",
+                  date_format="%Y-%m-%dT%H:%M:%S", **DATASET_CSV_OPTIONS)
+
+def _normalize(frame):
+    frame = frame.reset_index(drop=True)
+    for col in frame.columns:
+        if isinstance(frame[col].dtype, pd.CategoricalDtype):
+            frame[col] = frame[col].astype(object)
+    return frame.sort_values(list(frame.columns)).reset_index(drop=True)
+
+def assert_same_result(served, local):
+    assert served.keys() == local.keys()
+    for name in local:
+        if isinstance(local[name], pd.DataFrame):
+            pd.testing.assert_frame_equal(_normalize(served[name]), _normalize(local[name]),
+                                          check_dtype=False, rtol=1e-9)
+        else:
+            assert served[name] == pytest.approx(local[name], rel=1e-9), name
+
+@pytest.fixture
+def served(tmp_path):
+    path = str(tmp_path / "pedidos.csv")
+    _append_orders(path, 400, first_id=1, seed=1, header=True)
+    service = AggregationService(path, refresh_interval=0)
+    service.start_refresh()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.service = service
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield service, ServiceClient(f"http://127.0.0.1:{server.server_address[1]}"), path
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_to_jsonable():
+    frame = pd.DataFrame({"dia": pd.to_datetime(["2025-01-02", None]), "valor": [1.5, np.nan]})
+    assert to_jsonable({
+        "quando": pd.Timestamp("2025-01-02 03:04:05"),
+        "nunca": pd.NaT,
+        "dia64": np.datetime64("2025-01-02"),
+        "n": np.int64(3),
+        "x": np.float64(2.5),
+        "lista": (np.int32(1), "a"),
+        "frame": frame,
+    }) == {
+        "quando": "2025-01-02T03:04:05",
+        "nunca": None,
+        "dia64": "2025-01-02T00:00:00",
+        "n": 3,
+        "x": 2.5,
+        "lista": [1, "a"],
+        "frame": {"columns": ["dia", "valor"], "data": [["2025-01-02T00:00:00.000", 1.5], [None, None]]},
+    }
+
+FILTERS = [
+    {},
+    {"start": "2025-02-01", "end": "2025-02-28"},
+    {"start": "2025-01-15", "canais": ["MERCADOLIVRE-FULL", "SHOPEE-LOJA1"], "status": ["delivered", "shipped"]},
+]
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_panel_summary_matches_live(served, filters):
+    service, client, _ = served
+    resumo = client.panel_summary(**filters)
+    assert resumo["kpis"]["vendas_total"] > 0
+    assert pd.api.types.is_datetime64_any_dtype(resumo["vendas_dia"]["dateCreated"])
+    assert_same_result(resumo, service.live.panel_summary(**filters))
+
+@pytest.mark.parametrize("dates", [{}, {"start": "2025-02-01", "end": "2025-02-28"}])
+def test_sales_summary_and_options_match_live(served, dates):
+    service, client, _ = served
+    assert_same_result(client.sales_summary(**dates), service.live.sales_summary(**dates))
+    assert client.options(**dates) == service.live.options(**dates)
+
+def test_info_range_and_orders(served):
+    service, client, _ = served
+    info = client.info()
+    assert info["pedidos"] == 400 and info["versao"] == service.live.version
+    assert info["atualizado"] == pd.Timestamp(service.live.updated_at)
+    assert client.date_range() == tuple(service.live.date_range())
+
+    rows = client.orders("2025-02-01", "2025-02-28", canais=["MERCADOLIVRE-FULL"])
+    local = service.live.orders("2025-02-01", "2025-02-28", canais=["MERCADOLIVRE-FULL"])
+    assert len(rows) > 0
+    assert sorted(rows["id"]) == sorted(local["id"])
+    assert rows["dateCreated"].min() == local["dateCreated"].min()
+
+def test_bad_date_returns_400(served):
+    _, client, _ = served
+    with pytest.raises(HTTPError) as error:
+        urlopen(f"{client.url}/resumo/vendas?inicio=ontem")
+    assert error.value.code == 400
+    with pytest.raises(HTTPError) as error:
+        urlopen(f"{client.url}/nao-existe")
+    assert error.value.code == 404
+
+def test_cache_is_invalidated_by_new_data(served):
+    service, client, path = served
+    before = client.sales_summary()
+    client.sales_summary()
+    assert service.cache.hits == 1
+
+    _append_orders(path, 100, first_id=351, seed=2)
+    service.refresh()
+    after = client.sales_summary()
+    assert service.cache.misses == 2
+    assert client.info()["pedidos"] == 450
+    assert_same_result(after, service.live.sales_summary())
+    assert not after["pagamento"]["Quantidade"].equals(before["pagamento"]["Quantidade"])